@@ -0,0 +1,109 @@
+"""Benchmark: settings and achievement updates through the pool's JSON/JSONB codecs.
+
+Usage: python -m scripts.bench_json_codecs [--rounds 20000]
+       DATABASE_URL=postgres://... python -m scripts.bench_json_codecs  (adds round trips)
+
+The codec part times encoding and decoding the payloads with the stdlib json
+module and with the serializer Database registers (orjson when installed). With
+DATABASE_URL set it also times the settings and achievement UPDATEs, once with
+manual json.dumps/json.loads and once with native dicts on a connection set up by
+Database._init_connection. Seeded rows are rolled back; use a scratch database.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import datetime
+import asyncpg
+from src.utils.config import DATABASE_URL
+from src.database.connection import db, orjson, _json_dumps, _json_loads
+from src.database.migrations import run_migrations
+
+BENCH_USER_ID = -4_242_424_242
+
+SETTINGS = {
+    "discussion_duration": 90,
+    "voting_duration": 30,
+    "night_duration": 60,
+    "anonymous_votes": False,
+    "roles": {"impostor": 2, "detective": 1, "sheriff": 1, "engineer": 1},
+    "task_pool": [f"task_{i}" for i in range(12)],
+}
+ACHIEVEMENTS = {f"achievement_{i}": i % 3 != 0 for i in range(30)}
+
+def time_loop(label: str, func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<36} {elapsed / rounds * 1e6:8.2f}µs")
+    return elapsed
+
+def bench_codecs(rounds: int):
+    backend = "orjson" if orjson is not None else "stdlib json (orjson not installed)"
+    print(f"🧪 Encode + decode, {rounds:,} rounds - registered codec uses {backend}")
+    for name, payload in (("settings", SETTINGS), ("achievements", ACHIEVEMENTS)):
+        stdlib = time_loop(f"{name}: json.dumps/json.loads", lambda: json.loads(json.dumps(payload)), rounds)
+        codec = time_loop(f"{name}: registered codec", lambda: _json_loads(_json_dumps(payload)), rounds)
+        print(f"  {name}: {stdlib / codec:.1f}x")
+
+async def time_updates(conn: asyncpg.Connection, native: bool, game_id: str, rounds: int):
+    encode = (lambda value: value) if native else json.dumps
+    decode = (lambda value: value) if native else json.loads
+    for name, query, payload, key in (
+        ("settings", "UPDATE games SET settings = $1 WHERE id = $2 RETURNING settings", SETTINGS, game_id),
+        ("achievements", "UPDATE users SET achievements = achievements || $1 WHERE id = $2 RETURNING achievements", ACHIEVEMENTS, BENCH_USER_ID),
+    ):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            result = decode(await conn.fetchval(query, encode(payload), key))
+        elapsed = time.perf_counter() - start
+        assert isinstance(result, dict)
+        print(f"  {name:<14} {elapsed / rounds * 1e6:8.0f}µs per update")
+
+async def bench_round_trips(rounds: int, native: bool):
+    conn = await asyncpg.connect(DATABASE_URL)
+    if native:
+        await db._init_connection(conn)
+    game_id = f"bench-{uuid.uuid4()}"
+    transaction = conn.transaction()
+    await transaction.start()
+    try:
+        await conn.execute(
+            "INSERT INTO games (id, mode, group_id, phase, start_time, creator_id) VALUES ($1, 'ranked', -1, 'lobby', $2, 1)",
+            game_id, datetime.now()
+        )
+        await conn.execute("INSERT INTO users (id) VALUES ($1) ON CONFLICT (id) DO NOTHING", BENCH_USER_ID)
+        await time_updates(conn, native, game_id, rounds)
+    finally:
+        await transaction.rollback()
+        await conn.close()
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20_000)
+    args = parser.parse_args()
+
+    bench_codecs(args.rounds)
+
+    if not DATABASE_URL:
+        print("ℹ️ DATABASE_URL is not set - skipping the UPDATE round trips")
+        return 0
+
+    conn = await asyncpg.connect(DATABASE_URL)
+    try:
+        await run_migrations(conn)
+    finally:
+        await conn.close()
+
+    round_trips = max(args.rounds // 10, 1)
+    print(f"\n🐢 Manual json.dumps/json.loads, {round_trips:,} updates each")
+    await bench_round_trips(round_trips, native=False)
+    print(f"\n🚀 Native dicts through the registered codecs, {round_trips:,} updates each")
+    await bench_round_trips(round_trips, native=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,97 @@
+"""Benchmark: per-query latency of the hot statements through the pool, cold vs warm.
+
+Usage: DATABASE_URL=postgres://... python -m scripts.bench_prepared_statements [--rounds 2000]
+
+Every call acquires a connection and releases it again, the way the Database
+methods do. The statements run as SQL text, so asyncpg's statement cache
+prepares each one the first time a connection sees it and reuses it after
+that. "Cold" is a pool that opens its connection lazily (min_size=0). "Warm"
+opens it up front like Database.connect. Both use Database._init_connection.
+The seeded game is deleted at the end; use a scratch database all the same.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List
+import asyncpg
+from src.utils.config import DATABASE_URL
+from src.database.connection import STATEMENTS, db
+from src.database.migrations import run_migrations
+
+PLAYERS = 20
+
+def hot_queries(game_id: str) -> Dict[str, tuple]:
+    """Statement name -> args, one of the calls made every vote or night action"""
+    return {
+        "get_players": (game_id,),
+        "update_player_is_alive": (True, game_id, 1),
+        "record_vote": (game_id, 1, 2, 1),
+        "update_game_phase": ("voting", game_id),
+    }
+
+async def seed(conn: asyncpg.Connection, game_id: str):
+    await conn.execute(
+        "INSERT INTO games (id, mode, group_id, phase, start_time, creator_id) VALUES ($1, 'ranked', -1, 'night', $2, 1)",
+        game_id, datetime.now()
+    )
+    await conn.executemany(
+        "INSERT INTO players (game_id, user_id, role) VALUES ($1, $2, 'crewmate')",
+        [(game_id, user_id) for user_id in range(1, PLAYERS + 1)]
+    )
+
+async def cleanup(conn: asyncpg.Connection, game_id: str):
+    await conn.execute("DELETE FROM votes WHERE game_id = $1", game_id)
+    await conn.execute("DELETE FROM players WHERE game_id = $1", game_id)
+    await conn.execute("DELETE FROM games WHERE id = $1", game_id)
+
+async def run(pool: asyncpg.Pool, game_id: str, rounds: int) -> Dict[str, List[float]]:
+    timings: Dict[str, List[float]] = {}
+    for name, args in hot_queries(game_id).items():
+        samples = timings.setdefault(name, [])
+        for _ in range(rounds):
+            start = time.perf_counter()
+            async with pool.acquire() as conn:
+                await conn.fetch(STATEMENTS[name], *args)
+            samples.append(time.perf_counter() - start)
+    return timings
+
+def report(label: str, timings: Dict[str, List[float]]):
+    print(f"\n{label}")
+    for name, samples in timings.items():
+        first = samples[0] * 1e6
+        median = statistics.median(samples) * 1e6
+        p95 = statistics.quantiles(samples, n=20)[-1] * 1e6
+        print(f"  {name:<24} first {first:8.0f}µs  median {median:7.0f}µs  p95 {p95:7.0f}µs")
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    if not DATABASE_URL:
+        print("🚨 DATABASE_URL is not set - point it at a scratch database")
+        return 2
+
+    game_id = f"bench-{uuid.uuid4()}"
+    conn = await asyncpg.connect(DATABASE_URL)
+    try:
+        await run_migrations(conn)
+        await seed(conn, game_id)
+        for label, min_size in (("🐢 Cold pool (connection opened on first use)", 0),
+                                ("🚀 Warm pool (opened at connect)", 1)):
+            pool = await asyncpg.create_pool(DATABASE_URL, min_size=min_size, max_size=1, init=db._init_connection)
+            try:
+                report(label, await run(pool, game_id, args.rounds))
+            finally:
+                await pool.close()
+    finally:
+        await cleanup(conn, game_id)
+        await conn.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,60 @@
+"""Microbenchmark: decoding 20-player rosters with and without pydantic validation.
+
+Usage: python -m scripts.bench_row_decode [--rounds 100000]
+
+Times the shared decoder in src.database.connection (_player_from_row, which
+validates) against model_construct with manual enum coercion, the validation-free
+path that was tried and dropped because it came out slower under pydantic 2.
+Rows are plain dicts shaped like the asyncpg Records of the players table; no
+database is needed.
+"""
+import argparse
+import time
+from src.database.connection import _player_from_row
+from src.database.models import Player, Role
+
+ROLES = [Role.IMPOSTOR, Role.IMPOSTOR, Role.DETECTIVE, Role.SHERIFF, Role.ENGINEER] + [Role.CREWMATE] * 15
+
+def make_roster(size: int = 20) -> list:
+    return [
+        {
+            "game_id": "bench-game",
+            "user_id": 1_000_000 + seat,
+            "role": ROLES[seat % len(ROLES)].value,
+            "is_alive": seat % 3 != 0,
+            "voted": False,
+            "completed_task": seat % 2 == 0,
+            "sheriff_used_shot": False,
+            "detective_last_investigation": 0,
+            "engineer_used_ability": False,
+        }
+        for seat in range(size)
+    ]
+
+def bench(label: str, decode, roster: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        [decode(row) for row in roster]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.2f}s total  {elapsed / rounds * 1e6:8.2f}µs per roster")
+    return elapsed
+
+def construct_player(row: dict) -> Player:
+    return Player.model_construct(**{**row, "role": Role(row["role"])})
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=100_000)
+    args = parser.parse_args()
+
+    roster = make_roster()
+    # Both paths must agree on what they build
+    assert [_player_from_row(row) for row in roster] == [construct_player(row) for row in roster]
+
+    print(f"🧪 Decoding a {len(roster)}-player roster {args.rounds:,} times")
+    validated = bench("_player_from_row", _player_from_row, roster, args.rounds)
+    constructed = bench("model_construct", construct_player, roster, args.rounds)
+    print(f"📊 model_construct takes {constructed / validated:.2f}x the time of the validating decoder")
+
+if __name__ == "__main__":
+    main()
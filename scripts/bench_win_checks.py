@@ -0,0 +1,91 @@
+"""Benchmark: win and explosion checks over synthetic games, roster scans vs RosterBits.
+
+Usage: python -m scripts.bench_win_checks [--games 10000] [--rounds 20]
+
+Builds random 4-20 player games, kills a few players per round, and after each
+round runs both checks two ways: the roster-scanning logic WinConditions used
+before (over in-memory Player lists, so no database time is counted) and the
+bitmask popcounts in src.game.roster_bits. The two must agree on every check.
+
+The old explosion check only looked at the first living engineer, while
+RosterBits accepts any living engineer with an unused fix. Every synthetic
+roster has exactly one engineer, where the two rules are the same.
+"""
+import argparse
+import random
+import time
+from typing import List, Optional
+from src.database.models import Player, Role
+from src.game.roster_bits import RosterBits
+
+def make_roster(rng: random.Random, game_id: str) -> List[Player]:
+    size = rng.randint(4, 20)
+    impostors = 1 if size < 8 else 2
+    roles = [Role.IMPOSTOR] * impostors + [Role.DETECTIVE, Role.SHERIFF, Role.ENGINEER]
+    roles = (roles + [Role.CREWMATE] * size)[:size]
+    rng.shuffle(roles)
+    return [Player.model_construct(game_id=game_id, user_id=seat + 1, role=role, is_alive=True,
+                                   engineer_used_ability=False) for seat, role in enumerate(roles)]
+
+def scan_win_condition(players: List[Player]) -> Optional[str]:
+    alive_players = [p for p in players if p.is_alive]
+    alive_impostors = [p for p in alive_players if p.role == Role.IMPOSTOR]
+    alive_others = [p for p in alive_players if p.role != Role.IMPOSTOR]
+    if len(alive_impostors) == 0:
+        return "crewmates"
+    if len(alive_impostors) >= len(alive_others):
+        return "impostors"
+    return None
+
+def scan_ship_explodes(players: List[Player], failed_task_rounds: int) -> bool:
+    if failed_task_rounds < 2:
+        return False
+    engineer = next((p for p in players if p.role == Role.ENGINEER and p.is_alive), None)
+    return not engineer or engineer.engineer_used_ability
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    games = []
+    for index in range(args.games):
+        players = make_roster(rng, f"bench-{index}")
+        games.append((players, RosterBits(players)))
+
+    scan_time = bits_time = 0.0
+    checks = 0
+    for _ in range(args.rounds):
+        for players, bits in games:
+            # One night and one vote: a couple of deaths, maybe a failed round or an engineer fix
+            for victim in rng.sample(players, min(2, len(players))):
+                victim.is_alive = False
+                bits.kill(victim.user_id)
+            if rng.random() < 0.4:
+                bits.failed_task_rounds += 1
+            engineer = next((p for p in players if p.role == Role.ENGINEER), None)
+            if engineer and rng.random() < 0.1:
+                engineer.engineer_used_ability = True
+                bits.use_engineer_ability(engineer.user_id)
+
+            start = time.perf_counter()
+            scanned = (scan_win_condition(players), scan_ship_explodes(players, bits.failed_task_rounds))
+            middle = time.perf_counter()
+            popcounted = (bits.win_condition(), bits.ship_explodes())
+            end = time.perf_counter()
+
+            assert scanned == popcounted, (scanned, popcounted)
+            scan_time += middle - start
+            bits_time += end - middle
+            checks += 1
+
+    print(f"🧪 {checks:,} win + explosion checks over {args.games:,} synthetic games")
+    print(f"  roster scan  {scan_time / checks * 1e6:8.2f}µs per check")
+    print(f"  RosterBits   {bits_time / checks * 1e6:8.2f}µs per check")
+    print(f"🚀 Bitmask checks are {scan_time / bits_time:.1f}x faster")
+
+if __name__ == "__main__":
+    main()
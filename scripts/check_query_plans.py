@@ -0,0 +1,159 @@
+"""EXPLAIN the hot queries against a scratch database and assert they use their indexes.
+
+Usage: DATABASE_URL=postgres://... python -m scripts.check_query_plans
+
+Migrations are applied to the target database. The synthetic rows are inserted
+inside a transaction that is rolled back at the end, so point it at a test
+database, not production.
+
+idx_players_game_role and idx_votes_game_round (user-005) are not checked: GameSession
+took over per-role rosters and vote tallies, nothing issues those queries any more,
+and migration 7 drops both indexes.
+"""
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Set
+import asyncpg
+from src.utils.config import DATABASE_URL
+from src.database.migrations import run_migrations
+
+# (label, query, args, index the plan must use)
+HOT_QUERIES = [
+    (
+        "get_game_by_group",
+        "SELECT * FROM games WHERE group_id = $1 AND phase != 'ended' ORDER BY start_time DESC LIMIT 1",
+        (-1_000_007,),
+        "idx_games_active_group",
+    ),
+    (
+        "get_game_by_id",
+        "SELECT * FROM games WHERE id = $1",
+        ("plan-check-game-42",),
+        "games_pkey",
+    ),
+    (
+        "get_players",
+        "SELECT * FROM players WHERE game_id = $1",
+        ("plan-check-game-42",),
+        "players_pkey",
+    ),
+    (
+        "update_player_is_alive",
+        "UPDATE players SET is_alive = $1 WHERE game_id = $2 AND user_id = $3",
+        (False, "plan-check-game-42", 42_000_003),
+        "players_pkey",
+    ),
+    (
+        "archive_ended_games (votes of a game)",
+        "SELECT * FROM votes WHERE game_id = $1",
+        ("plan-check-game-42",),
+        "votes_pkey",
+    ),
+    (
+        "get_display_names",
+        "SELECT id, display_name FROM users WHERE id = ANY($1::BIGINT[])",
+        ([42_000_001, 42_000_002, 42_000_003],),
+        "users_pkey",
+    ),
+    (
+        "archive_ended_games (batch select)",
+        "SELECT id FROM games WHERE phase = 'ended' AND end_time < $1 ORDER BY end_time LIMIT $2",
+        (datetime.now() - timedelta(days=300), 100),
+        "idx_games_ended",
+    ),
+    (
+        "purge_archived_votes (batch select)",
+        "SELECT ctid FROM votes_archive WHERE timestamp < $1 LIMIT $2",
+        (datetime.now() - timedelta(days=300), 100),
+        "idx_votes_archive_timestamp",
+    ),
+]
+
+SEED = [
+    # Mostly ended games spread over a year, plus a handful of live ones
+    """
+    INSERT INTO games (id, mode, group_id, phase, start_time, end_time, creator_id)
+    SELECT 'plan-check-game-' || g, 'ranked', -1000000 - (g % 500),
+           CASE WHEN g % 1000 = 7 THEN 'night' ELSE 'ended' END,
+           NOW() - (g || ' minutes')::INTERVAL,
+           CASE WHEN g % 1000 = 7 THEN NULL ELSE NOW() - (g || ' minutes')::INTERVAL END,
+           1
+    FROM generate_series(1, 20000) AS g
+    """,
+    """
+    INSERT INTO players (game_id, user_id, role)
+    SELECT 'plan-check-game-' || g, g::BIGINT * 1000000 + p, 'crewmate'
+    FROM generate_series(1, 5000) AS g, generate_series(1, 10) AS p
+    """,
+    """
+    INSERT INTO votes (game_id, voter_id, target_id, round_number)
+    SELECT 'plan-check-game-' || g, g::BIGINT * 1000000 + v, NULL, r
+    FROM generate_series(1, 5000) AS g, generate_series(1, 5) AS v, generate_series(1, 3) AS r
+    """,
+    """
+    INSERT INTO users (id, display_name)
+    SELECT 42000000 + u, 'player ' || u FROM generate_series(1, 20000) AS u
+    ON CONFLICT (id) DO NOTHING
+    """,
+    """
+    INSERT INTO votes_archive (game_id, voter_id, target_id, round_number, timestamp)
+    SELECT 'plan-check-game-' || (v % 5000), v, NULL, 1, NOW() - (v || ' minutes')::INTERVAL
+    FROM generate_series(1, 50000) AS v
+    """,
+    "ANALYZE games",
+    "ANALYZE players",
+    "ANALYZE votes",
+    "ANALYZE users",
+    "ANALYZE votes_archive",
+]
+
+def _indexes_used(plan: Dict[str, Any]) -> Set[str]:
+    found = set()
+    if "Index Name" in plan:
+        found.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        found |= _indexes_used(child)
+    return found
+
+async def check(conn: asyncpg.Connection) -> List[str]:
+    failures = []
+    for label, query, args, index in HOT_QUERIES:
+        raw = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {query}", *args)
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        used = _indexes_used(plan)
+        if index in used:
+            print(f"✅ {label}: {plan['Node Type']} using {index}")
+        else:
+            failures.append(label)
+            print(f"❌ {label}: expected {index}, got {plan['Node Type']} using {sorted(used) or 'no index'}")
+    return failures
+
+async def main() -> int:
+    if not DATABASE_URL:
+        print("🚨 DATABASE_URL is not set - point it at a scratch database")
+        return 2
+
+    conn = await asyncpg.connect(DATABASE_URL)
+    try:
+        await run_migrations(conn)
+        transaction = conn.transaction()
+        await transaction.start()
+        try:
+            for statement in SEED:
+                await conn.execute(statement)
+            failures = await check(conn)
+        finally:
+            await transaction.rollback()
+    finally:
+        await conn.close()
+
+    if failures:
+        print(f"💥 {len(failures)} hot queries are not using their index")
+        return 1
+    print("🚀 Every hot query uses its index")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
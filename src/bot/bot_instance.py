@@ -1,6 +1,7 @@
 from telegram.ext import Application
 from src.utils.config import BOT_TOKEN
 from src.database.connection import db
+from src.database.journal import journal
 from src.game.game_state import GameState
 from src.game.phase_manager import PhaseManager
 from src.game.task_engine import TaskEngine
@@ -9,6 +10,9 @@ from src.systems.logger import GameLogger, BotLogger
 from src.systems.xp_system import XPSystem
 from src.systems.achievement_system import AchievementSystem
 from src.systems.ban_system import BanSystem
+from src.systems.archiver import GameArchiver
+from src.systems.admin_cache import AdminCache
+from src.systems.dm_reachability import DMReachability
 
 class BotInstance:
     def __init__(self):
@@ -26,19 +30,37 @@ class BotInstance:
         self.achievement_system = AchievementSystem(self.bot)
         self.xp_system = XPSystem(self.achievement_system)
         self.ban_system = BanSystem(self.bot_logger)
+        self.archiver = GameArchiver(self.bot_logger)
+        self.admin_cache = AdminCache(self.bot)
+        self.dm = DMReachability(self.bot)
         
         self.phase_manager = PhaseManager(
             self.bot, 
             self.game_state, 
             self.task_engine, 
             self.game_logger, 
-            self.xp_system
+            self.xp_system,
+            self.ban_system,
+            self.dm
         )
 
     async def initialize(self):
         await db.connect()
+        await self.ban_system.load()
+        self.ban_system.start()
+        self.archiver.start()
 
     async def shutdown(self):
+        await self.archiver.stop()
+        await self.ban_system.stop()
+        # Live games are ahead of the database until the journal is written; during an outage
+        # drain gives up and logs the games that are behind instead of blocking shutdown
+        if await journal.drain():
+            for game_id in list(self.game_state.active_games.values()):
+                try:
+                    await self.game_state.sync_game(game_id)
+                except Exception as e:
+                    print(f"💾 Could not write game {game_id} back before shutdown: {e}")
         await db.disconnect()
 
 bot_instance = BotInstance()
\ No newline at end of file
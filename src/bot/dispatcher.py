@@ -1,10 +1,15 @@
-from telegram.ext import CommandHandler, CallbackQueryHandler, MessageHandler, filters
+from telegram import Update
+from telegram.ext import CommandHandler, CallbackQueryHandler, ChatMemberHandler, MessageHandler, TypeHandler, filters
 from src.bot.handlers import commands, admin, callbacks
 from src.utils.constants import COMMAND_PREFIXES
 
 def setup_handlers(application):
     prefixes = "|".join(f"\\{prefix}" for prefix in COMMAND_PREFIXES)
     
+    # Group -1 sees every update without consuming it; block=False lets the real
+    # handlers run without waiting on the name upsert
+    application.add_handler(TypeHandler(Update, callbacks.capture_display_name, block=False), group=-1)
+    
     command_handlers = [
         CommandHandler(["start"], commands.start_command),
         CommandHandler(["startgame"], commands.startgame_command),
@@ -35,6 +40,8 @@ def setup_handlers(application):
     for handler in callback_handlers:
         application.add_handler(handler)
     
+    application.add_handler(ChatMemberHandler(callbacks.chat_member_callback, ChatMemberHandler.ANY_CHAT_MEMBER))
+    
     # Add team chat handler for impostors and detectives
     team_chat_handler = MessageHandler(
         filters.TEXT & filters.ChatType.PRIVATE,
@@ -21,7 +21,7 @@ async def xban_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(f"✅ User {user_id} banned for {duration}")
         
     except ValueError:
-        await update.message.reply_text("❌ Invalid user ID!")
+        await update.message.reply_text("❌ Invalid user ID or duration! Use e.g. 12h, 7d, 1m or perma.")
     except Exception as e:
         await update.message.reply_text(f"❌ Error: {str(e)}")
 
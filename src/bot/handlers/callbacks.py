@@ -4,6 +4,7 @@ from src.bot.bot_instance import bot_instance
 from src.database.models import GamePhase, GameMode, Role
 from src.ui.messages import Messages
 from src.ui.keyboards import Keyboards
+from src.utils.constants import DISPLAY_NAME_MAX_LENGTH
 
 async def join_game_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
@@ -17,20 +18,28 @@ async def join_game_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await query.edit_message_text("❌ Game no longer available!")
         return
     
-    if await bot_instance.ban_system.is_user_banned(user_id) and game.mode == GameMode.RANKED:
+    if bot_instance.ban_system.is_user_banned(user_id) and game.mode == GameMode.RANKED:
         await query.answer("🚫 You are banned from ranked games!", show_alert=True)
         return
     
+    if not bot_instance.dm.is_reachable(user_id):
+        await query.answer("❌ Please start a conversation with me in DM first!", show_alert=True)
+        return
+    
     if await bot_instance.game_state.join_game(game_id, user_id):
         try:
-            await bot_instance.bot.send_message(user_id, "✅ You joined the game! Wait for it to start.")
+            reachable = await bot_instance.dm.send(user_id, "✅ You joined the game! Wait for it to start.")
         except:
+            reachable = False
+        if not reachable:
+            bot_instance.game_state.leave_lobby(game_id, user_id)
             await query.answer("❌ Please start a conversation with me in DM first!", show_alert=True)
             return
         
         players = bot_instance.game_state.get_lobby_players(game_id)
+        names = await bot_instance.db.get_display_names(players + [game.creator_id])
         await query.edit_message_text(
-            Messages.get_lobby_message(players, game.mode, game.creator_id),
+            Messages.get_lobby_message(players, game.mode, game.creator_id, names),
             reply_markup=Keyboards.get_join_game_keyboard(game_id)
         )
     else:
@@ -57,8 +66,8 @@ async def begin_game_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
         await query.answer("❌ Need at least 4 players!", show_alert=True)
         return
     
-    await bot_instance.phase_manager.start_game_from_lobby(game_id, query.message.chat.id)
-    await query.edit_message_text(Messages.get_game_started_message())
+    if await bot_instance.phase_manager.start_game_from_lobby(game_id, query.message.chat.id):
+        await query.edit_message_text(Messages.get_game_started_message())
 
 async def end_game_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
@@ -72,11 +81,9 @@ async def end_game_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.answer("❌ No active game!", show_alert=True)
         return
     
-    chat_member = await bot_instance.bot.get_chat_member(query.message.chat.id, user_id)
-    is_admin = chat_member.status in ['administrator', 'creator']
     is_creator = user_id == game.creator_id
     
-    if not (is_admin or is_creator):
+    if not (is_creator or await bot_instance.admin_cache.is_admin(query.message.chat.id, user_id)):
         await query.answer("❌ Only admins or creator can end game!", show_alert=True)
         return
     
@@ -98,13 +105,15 @@ async def vote_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     user_id = query.from_user.id
     
-    # Fix: Get game by game_id, not hardcoded 0
-    game = await bot_instance.db.get_game_by_id(game_id)
-    if not game or game.phase != GamePhase.VOTING:
+    # Checks and the vote itself are in-memory; the session journals the writes
+    session = bot_instance.game_state.get_session(game_id)
+    game = session.game if session else None
+    # The phase stays VOTING while resolve_voting tallies, but close_voting has already run
+    if not game or game.phase != GamePhase.VOTING or not session.voting_open:
         await query.edit_message_text("❌ Voting phase not active!")
         return
     
-    player = await bot_instance.db.get_player(game_id, user_id)
+    player = session.get_player(user_id)
     if not player or not player.is_alive:
         await query.answer("❌ You cannot vote!", show_alert=True)
         return
@@ -115,15 +124,33 @@ async def vote_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     await bot_instance.game_state.vote_player(game_id, user_id, target_id)
     
+    names = await bot_instance.db.get_display_names([user_id, target_id] if target_id else [user_id])
+    
     # Announce in group that player voted (anonymously)
     await bot_instance.bot.send_message(
         game.group_id, 
-        f"✅ Player {user_id} has voted."
+        f"✅ {Messages.player_name(user_id, names)} has voted."
     )
     
-    vote_text = f"Player {target_id}" if target_id else "Skip"
+    vote_text = Messages.player_name(target_id, names) if target_id else "Skip"
     await query.edit_message_text(f"✅ You voted for: {vote_text}")
 
+async def ready_to_vote_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Count a living player as ready to end discussion early"""
+    query = update.callback_query
+    
+    game_id = query.data.split("_")[-1]
+    user_id = query.from_user.id
+    
+    session = bot_instance.game_state.get_session(game_id)
+    player = session.get_player(user_id) if session else None
+    if not player or not player.is_alive or session.game.phase != GamePhase.DISCUSSION:
+        await query.answer("❌ You can't call the vote now!", show_alert=True)
+        return
+    
+    ready, needed = bot_instance.phase_manager.mark_ready_to_vote(session, user_id)
+    await query.answer(f"✋ Ready to vote ({ready}/{needed})")
+
 # NEW: Missing night action callbacks for each role
 async def impostor_kill_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle impostor kill actions"""
@@ -137,12 +164,14 @@ async def impostor_kill_callback(update: Update, context: ContextTypes.DEFAULT_T
     user_id = query.from_user.id
     
     # Validate player can act
-    player = await bot_instance.db.get_player(game_id, user_id)
+    session = bot_instance.game_state.get_session(game_id)
+    player = session.get_player(user_id) if session else None
     if not player or not player.is_alive or player.role != Role.IMPOSTOR:
         await query.answer("❌ You cannot perform this action!", show_alert=True)
         return
     
     if action == "skip":
+        session.actor_done(user_id)  # A deliberate pass still counts as acting
         await query.edit_message_text("🔪 You chose to skip killing.")
         return
     
@@ -164,12 +193,14 @@ async def detective_investigate_callback(update: Update, context: ContextTypes.D
     target_id = int(parts[3]) if len(parts) > 3 and parts[3] != game_id else None
     user_id = query.from_user.id
     
-    player = await bot_instance.db.get_player(game_id, user_id)
+    session = bot_instance.game_state.get_session(game_id)
+    player = session.get_player(user_id) if session else None
     if not player or not player.is_alive or player.role != Role.DETECTIVE:
         await query.answer("❌ You cannot perform this action!", show_alert=True)
         return
     
     if action == "skip":
+        session.actor_done(user_id)
         await query.edit_message_text("🕵️ You chose to skip investigating.")
         return
     
@@ -190,17 +221,19 @@ async def sheriff_shoot_callback(update: Update, context: ContextTypes.DEFAULT_T
     target_id = int(parts[3]) if len(parts) > 3 and parts[3] != game_id else None
     user_id = query.from_user.id
     
-    player = await bot_instance.db.get_player(game_id, user_id)
+    session = bot_instance.game_state.get_session(game_id)
+    player = session.get_player(user_id) if session else None
     if not player or not player.is_alive or player.role != Role.SHERIFF:
         await query.answer("❌ You cannot perform this action!", show_alert=True)
         return
     
     # Check if already used shot
-    if await bot_instance.db.get_player_field(game_id, user_id, "sheriff_used_shot"):
+    if player.sheriff_used_shot:
         await query.answer("❌ You already used your shot!", show_alert=True)
         return
     
     if action == "skip":
+        session.actor_done(user_id)
         await query.edit_message_text("🔫 You chose not to shoot.")
         return
     
@@ -224,7 +257,8 @@ async def task_complete_callback(update: Update, context: ContextTypes.DEFAULT_T
         return
     
     # Validate player can complete tasks
-    player = await bot_instance.db.get_player(game_id, user_id)
+    session = bot_instance.game_state.get_session(game_id)
+    player = session.get_player(user_id) if session else None
     if not player or not player.is_alive or player.role != Role.CREWMATE:
         await query.answer("❌ You cannot complete tasks!", show_alert=True)
         return
@@ -246,25 +280,20 @@ async def engineer_fix_callback(update: Update, context: ContextTypes.DEFAULT_TY
     game_id = parts[2]
     user_id = query.from_user.id
     
-    player = await bot_instance.db.get_player(game_id, user_id)
+    session = bot_instance.game_state.get_session(game_id)
+    player = session.get_player(user_id) if session else None
     if not player or not player.is_alive or player.role != Role.ENGINEER:
         await query.answer("❌ You are not the engineer!", show_alert=True)
         return
     
     # Check if already used ability
-    if await bot_instance.db.get_player_field(game_id, user_id, "engineer_used_ability"):
+    if player.engineer_used_ability:
         await query.answer("❌ You already used your fix ability!", show_alert=True)
         return
     
     if action == "fix":
         # Mark as used and reset failed rounds
-        await bot_instance.db.update_player_field(game_id, user_id, "engineer_used_ability", True)
-        game = await bot_instance.db.get_game_by_id(game_id)
-        if game:
-            # Reset failed count by updating game settings
-            settings = game.settings or {}
-            settings['failed_task_rounds'] = 0
-            await bot_instance.db.update_game_settings(game_id, settings)
+        session.use_engineer_fix(user_id)
         await bot_instance.xp_system.award_xp(user_id, "engineer_saves_ship")
         await query.edit_message_text("⚙️ Ship systems fixed! Crisis averted!")
         
@@ -275,9 +304,7 @@ async def engineer_fix_callback(update: Update, context: ContextTypes.DEFAULT_TY
         await bot_instance.game_logger.log_engineer_action(game_id, user_id, False)
     
     # Continue to normal discussion phase
-    game = await bot_instance.db.get_game_by_id(game_id)
-    if game:
-        await bot_instance.phase_manager._continue_to_discussion(game_id, game.group_id)
+    await bot_instance.phase_manager._continue_to_discussion(game_id, session.game.group_id)
 
 async def engineer_day_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle engineer day actions (deprecated, but kept for backward compatibility)"""
@@ -320,6 +347,8 @@ async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TY
         await end_game_callback(update, context)
     elif callback_data.startswith("vote_"):
         await vote_callback(update, context)
+    elif callback_data.startswith("ready_vote_"):
+        await ready_to_vote_callback(update, context)
     elif callback_data.startswith("impostor_"):
         await impostor_kill_callback(update, context)
     elif callback_data.startswith("detective_"):
@@ -336,27 +365,55 @@ async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TY
         # Handle unknown callbacks gracefully
         await query.answer("❌ Unknown action!", show_alert=True)
 
+async def chat_member_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Keep cached admin lists and DM reachability current as chat member statuses change"""
+    member_update = update.chat_member or update.my_chat_member
+    if update.my_chat_member and member_update.chat.type == 'private':
+        # Private chat status is the user blocking ('kicked') or unblocking the bot
+        if member_update.new_chat_member.status == 'kicked':
+            bot_instance.dm.mark_unreachable(member_update.from_user.id)
+        else:
+            bot_instance.dm.mark_reachable(member_update.from_user.id)
+    elif update.my_chat_member:
+        # The bot's own rights changed - what it can see of the admin list may have too
+        bot_instance.admin_cache.invalidate(member_update.chat.id)
+    else:
+        bot_instance.admin_cache.apply_update(member_update)
+
+async def capture_display_name(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Remember the sender's name from every update so rosters can show it without API calls"""
+    user = update.effective_user
+    if not user or user.is_bot:
+        return
+    
+    # Best effort: a slow or failing database must never hold up the update itself
+    try:
+        await bot_instance.db.remember_display_name(user.id, user.full_name[:DISPLAY_NAME_MAX_LENGTH])
+    except Exception as e:
+        print(f"🏷️ Could not remember display name for {user.id}: {e}")
+
 async def team_chat_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle team chat messages for impostors and detectives"""
     message = update.message
     user_id = message.from_user.id
     chat_text = message.text
     
-    # Get the current game for this user
-    game = await bot_instance.game_state.get_game_by_user(user_id)
-    if not game:
+    # In-memory lookup: DMs from users who are not playing stop here
+    game_id = bot_instance.game_state.get_game_id_by_user(user_id)
+    if not game_id:
         return
     
     # Check if user is in the game
-    player = await bot_instance.db.get_player(game.id, user_id)
+    session = bot_instance.game_state.get_session(game_id)
+    player = session.get_player(user_id) if session else None
     if not player or not player.is_alive:
         return
     
     # Relay message to teammates based on role
     if player.role == Role.IMPOSTOR:
-        await bot_instance.phase_manager.relay_team_message(game.id, user_id, chat_text, Role.IMPOSTOR)
+        await bot_instance.phase_manager.relay_team_message(game_id, user_id, chat_text, Role.IMPOSTOR)
     elif player.role == Role.DETECTIVE:
-        await bot_instance.phase_manager.relay_team_message(game.id, user_id, chat_text, Role.DETECTIVE)
+        await bot_instance.phase_manager.relay_team_message(game_id, user_id, chat_text, Role.DETECTIVE)
 
 # DEPRECATED: Remove this old generic handler
 # async def night_action_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -2,12 +2,14 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from src.bot.bot_instance import bot_instance
 from src.database.models import GameMode, GamePhase
-from src.utils.config import RANKED_GC_IDS
+from src.utils.config import RANKED_GC_IDS, BOT_OWNER_ID
 from src.ui.messages import Messages
 from src.ui.keyboards import Keyboards
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
+    if update.effective_chat.type == 'private':
+        bot_instance.dm.mark_reachable(user_id)  # They just opened a DM with us
     
     await bot_instance.bot_logger.log_user_start(user_id)
     await bot_instance.db.create_user(user_id)
@@ -25,7 +27,7 @@ async def startgame_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     group_id = update.effective_chat.id
     creator_id = update.effective_user.id
     
-    if await bot_instance.ban_system.is_user_banned(creator_id):
+    if bot_instance.ban_system.is_user_banned(creator_id):
         await update.message.reply_text(Messages.get_banned_message("check your ban status"))
         return
     
@@ -47,7 +49,7 @@ async def startgame_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     game = await bot_instance.game_state.create_game(group_id, creator_id, mode)
     
     await update.message.reply_text(
-        Messages.get_lobby_message([], mode, creator_id),
+        Messages.get_lobby_message([], mode, creator_id, await bot_instance.db.get_display_names([creator_id])),
         reply_markup=Keyboards.get_join_game_keyboard(game.id)
     )
     
@@ -66,20 +68,28 @@ async def join_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(Messages.get_game_not_found_message())
         return
     
-    if await bot_instance.ban_system.is_user_banned(user_id) and game.mode == GameMode.RANKED:
+    if bot_instance.ban_system.is_user_banned(user_id) and game.mode == GameMode.RANKED:
         await update.message.reply_text(Messages.get_banned_message("check your ban status"))
         return
     
+    if not bot_instance.dm.is_reachable(user_id):
+        await update.message.reply_text(Messages.get_dm_redirect_message())
+        return
+    
     if await bot_instance.game_state.join_game(game.id, user_id):
         try:
-            await bot_instance.bot.send_message(user_id, "✅ You've entered the chaos! Wait for the madness to begin.")
+            reachable = await bot_instance.dm.send(user_id, "✅ You've entered the chaos! Wait for the madness to begin.")
         except:
+            reachable = False
+        if not reachable:
+            bot_instance.game_state.leave_lobby(game.id, user_id)
             await update.message.reply_text(Messages.get_dm_redirect_message())
             return
         
         players = bot_instance.game_state.get_lobby_players(game.id)
+        names = await bot_instance.db.get_display_names(players + [game.creator_id])
         await update.message.edit_text(
-            Messages.get_lobby_message(players, game.mode, game.creator_id),
+            Messages.get_lobby_message(players, game.mode, game.creator_id, names),
             reply_markup=Keyboards.get_join_game_keyboard(game.id)
         )
     else:
@@ -107,8 +117,8 @@ async def begin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Need at least 4 players to start the paranoia! Recruit more victims.")
         return
     
-    await bot_instance.phase_manager.start_game_from_lobby(game.id, group_id)
-    await update.message.reply_text(Messages.get_game_started_message())
+    if await bot_instance.phase_manager.start_game_from_lobby(game.id, group_id):
+        await update.message.reply_text(Messages.get_game_started_message())
 
 async def end_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if update.effective_chat.type == 'private':
@@ -123,11 +133,9 @@ async def end_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(Messages.get_game_not_found_message())
         return
     
-    chat_member = await bot_instance.bot.get_chat_member(group_id, user_id)
-    is_admin = chat_member.status in ['administrator', 'creator']
     is_creator = user_id == game.creator_id
     
-    if not (is_admin or is_creator):
+    if not (is_creator or await bot_instance.admin_cache.is_admin(group_id, user_id)):
         await update.message.reply_text("❌ Only admins or game creator can end the game! Power is everything.")
         return
     
@@ -152,7 +160,17 @@ async def info_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await _dm_only_command(update, "ℹ️ Game info available in DM!", "Game Information:\n\nAmong Us bot with roles, tasks, and XP system.")
 
 async def ping_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await update.message.reply_text("🏓 Pong! Bot is alive and ready to spread chaos.")
+    text = "🏓 Pong! Bot is alive and ready to spread chaos."
+    
+    # The owner also gets the cache hit rates
+    if update.effective_user.id == BOT_OWNER_ID:
+        lines = [
+            f"{name}: {stats['hits']} hits / {stats['misses']} misses ({stats['size']} cached)"
+            for name, stats in bot_instance.db.cache_stats().items()
+        ]
+        text += "\n\n📊 Caches\n" + "\n".join(lines)
+    
+    await update.message.reply_text(text)
 
 async def about_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await _dm_only_command(update, "📋 About info available in DM!", "🤖 Among Us Telegram Bot\n\nDeveloped for group gameplay with full role system.")
@@ -0,0 +1,188 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
+from src.database.models import Game, GamePhase, Player, User
+
+class GameCache:
+    """In-process cache of live games, keyed by id and by group.
+
+    Database keeps it current on every game write, so only misses reach PostgreSQL.
+    Ended games are never cached.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[str, Game] = {}
+        self._by_group: Dict[int, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, game_id: str) -> Optional[Game]:
+        game = self._by_id.get(game_id)
+        if game is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return game
+
+    def get_by_group(self, group_id: int) -> Optional[Game]:
+        game_id = self._by_group.get(group_id)
+        game = self._by_id.get(game_id) if game_id else None
+        if game is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return game
+
+    def put(self, game: Game):
+        if game.phase == GamePhase.ENDED:
+            self.evict(game.id)
+            return
+        self._by_id[game.id] = game
+        self._by_group[game.group_id] = game.id
+
+    def update(self, game_id: str, **fields):
+        """Apply a write to the cached game in place (no-op if it is not cached)"""
+        game = self._by_id.get(game_id)
+        if game is None:
+            return
+        for field, value in fields.items():
+            setattr(game, field, value)
+        if game.phase == GamePhase.ENDED:
+            self.evict(game_id)
+
+    def evict(self, game_id: str):
+        game = self._by_id.pop(game_id, None)
+        if game and self._by_group.get(game.group_id) == game_id:
+            del self._by_group[game.group_id]
+
+    def clear(self):
+        self._by_id.clear()
+        self._by_group.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._by_id), "hits": self.hits, "misses": self.misses}
+
+class RosterCache:
+    """Complete per-game rosters (user_id -> Player), kept current by write-through from Database.
+
+    A game is either cached with every player or not cached at all, so a roster hit
+    can answer "is this user in the game" without touching PostgreSQL.
+    """
+
+    def __init__(self):
+        self._rosters: Dict[str, Dict[int, Player]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, game_id: str) -> Optional[Dict[int, Player]]:
+        roster = self._rosters.get(game_id)
+        if roster is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return roster
+
+    def put(self, game_id: str, players: List[Player]) -> Dict[int, Player]:
+        roster = {player.user_id: player for player in players}
+        self._rosters[game_id] = roster
+        return roster
+
+    def update_player(self, game_id: str, user_id: int, **fields):
+        player = self._rosters.get(game_id, {}).get(user_id)
+        if player is None:
+            return
+        for field, value in fields.items():
+            setattr(player, field, value)
+
+    def evict(self, game_id: str):
+        self._rosters.pop(game_id, None)
+
+    def clear(self):
+        self._rosters.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._rosters), "hits": self.hits, "misses": self.misses}
+
+class UserCache:
+    """Size-bounded LRU of user profiles; entries also expire after ttl seconds"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._users: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[User]:
+        entry = self._users.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._users[user_id]
+            self.misses += 1
+            return None
+        self._users.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, user: User):
+        self._users[user.id] = (time.monotonic() + self.ttl, user)
+        self._users.move_to_end(user.id)
+        while len(self._users) > self.max_size:
+            self._users.popitem(last=False)
+
+    def update(self, user_id: int, **fields):
+        """Apply a write to the cached profile in place (no-op if it is not cached)"""
+        entry = self._users.get(user_id)
+        if entry is None:
+            return
+        for field, value in fields.items():
+            setattr(entry[1], field, value)
+
+    def evict(self, user_id: int):
+        self._users.pop(user_id, None)
+
+    def clear(self):
+        self._users.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._users), "hits": self.hits, "misses": self.misses}
+
+class NameCache:
+    """Bounded LRU of display names, filled passively from incoming updates.
+
+    An empty string records a user known to have no stored name, so renders
+    don't go back to PostgreSQL for them.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._names: "OrderedDict[int, str]" = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[str]:
+        return self._names.get(user_id)
+
+    def get_many(self, user_ids: List[int]) -> Tuple[Dict[int, str], List[int]]:
+        """Split user_ids into cached names and ids that still need a lookup"""
+        names: Dict[int, str] = {}
+        missing: List[int] = []
+        for user_id in user_ids:
+            name = self._names.get(user_id)
+            if name is None:
+                missing.append(user_id)
+                continue
+            self._names.move_to_end(user_id)
+            if name:
+                names[user_id] = name
+        return names, missing
+
+    def put(self, user_id: int, name: Optional[str]):
+        self._names[user_id] = name or ""
+        self._names.move_to_end(user_id)
+        while len(self._names) > self.max_size:
+            self._names.popitem(last=False)
+
+    def evict(self, user_id: int):
+        self._names.pop(user_id, None)
+
+    def clear(self):
+        self._names.clear()
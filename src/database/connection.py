@@ -1,57 +1,425 @@
 import asyncpg
 import json
 import asyncio
-from typing import Optional, List, Dict, Any
+import itertools
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, Tuple, Set, Callable
 from datetime import datetime
-from src.utils.config import DATABASE_URL
+from src.utils.config import (
+    DATABASE_URL, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_MAX_INACTIVE_LIFETIME,
+    USER_CACHE_SIZE, USER_CACHE_TTL, NAME_CACHE_SIZE, CACHE_INVALIDATION_CHANNEL, CACHE_INVALIDATION_DELAY
+)
 from src.database.models import User, Game, Player, Ban, GameMode, GamePhase, Role
+from src.database.migrations import run_migrations
+from src.database.cache import GameCache, RosterCache, UserCache, NameCache
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+def _json_dumps(value: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Errors that mean the connection (not the query) failed - these are the only ones worth retrying
+CONNECTION_ERRORS = (
+    asyncpg.exceptions.PostgresConnectionError,
+    asyncpg.exceptions.CannotConnectNowError,
+    # Not InterfaceError as a whole: it also covers client misuse, which a fresh pool won't fix
+    asyncpg.exceptions.ConnectionDoesNotExistError,
+    asyncpg.exceptions.InternalClientError,
+    OSError,
+)
+
+# Player columns that may be written through update_player_field (each gets its own prepared UPDATE)
+PLAYER_FIELDS = (
+    "is_alive",
+    "voted",
+    "completed_task",
+    "sheriff_used_shot",
+    "detective_last_investigation",
+    "engineer_used_ability",
+)
+
+# Hot statements by name. They run as plain SQL text, so asyncpg's per-connection
+# statement cache prepares each one once per connection and reuses it on every acquire.
+STATEMENTS = {
+    "get_players": "SELECT * FROM players WHERE game_id = $1",
+    "record_vote": "INSERT INTO votes (game_id, voter_id, target_id, round_number) VALUES ($1, $2, $3, $4) ON CONFLICT (game_id, voter_id, round_number) DO UPDATE SET target_id = $3",
+    "update_game_phase": "UPDATE games SET phase = $1 WHERE id = $2",
+    # Journaled writes carry the new values GameSession already holds, so a retried batch is idempotent
+    "set_night_round": """
+        WITH reset AS (
+            UPDATE players SET voted = FALSE, completed_task = FALSE WHERE game_id = $1
+        )
+        UPDATE games SET phase = $2, round_number = $3 WHERE id = $1
+    """,
+    "end_game": "UPDATE games SET phase = 'ended', end_time = $1 WHERE id = $2",
+    "reset_player_votes": "UPDATE players SET voted = FALSE WHERE game_id = $1",
+    "set_failed_task_rounds": "UPDATE games SET failed_task_rounds = $1 WHERE id = $2",
+    "add_player": "INSERT INTO players (game_id, user_id, role, sheriff_used_shot, detective_last_investigation, engineer_used_ability) VALUES ($1, $2, $3, $4, $5, $6)",
+    **{
+        f"update_player_{field}": f"UPDATE players SET {field} = $1 WHERE game_id = $2 AND user_id = $3"
+        for field in PLAYER_FIELDS
+    },
+}
+
+# One decoder per table, shared by every read. They go through the validating
+# constructors: with pydantic 2 that beats model_construct plus manual enum coercion.
+def _user_from_row(row: asyncpg.Record) -> User:
+    return User(
+        id=row['id'],
+        xp=row['xp'],
+        is_banned=row['is_banned'],
+        ban_expiry=row['ban_expiry'],
+        streak=row['streak'],
+        achievements=row['achievements'] or {},
+        display_name=row['display_name']
+    )
+
+def _game_from_row(row: asyncpg.Record) -> Game:
+    return Game(
+        id=row['id'],
+        mode=row['mode'],
+        group_id=row['group_id'],
+        phase=row['phase'],
+        start_time=row['start_time'],
+        end_time=row['end_time'],
+        creator_id=row['creator_id'],
+        failed_task_rounds=row['failed_task_rounds'],
+        round_number=row['round_number'],
+        settings=row['settings'] or {}
+    )
+
+def _ban_from_row(row: asyncpg.Record) -> Ban:
+    return Ban(
+        user_id=row['user_id'],
+        start_time=row['start_time'],
+        duration=row['duration'],
+        reason=row['reason'],
+        expires_at=row['expires_at']
+    )
+
+def _player_from_row(row: asyncpg.Record) -> Player:
+    return Player(
+        game_id=row['game_id'],
+        user_id=row['user_id'],
+        role=row['role'],
+        is_alive=row['is_alive'],
+        voted=row['voted'],
+        completed_task=row['completed_task'],
+        sheriff_used_shot=row['sheriff_used_shot'],
+        detective_last_investigation=row['detective_last_investigation'],
+        engineer_used_ability=row['engineer_used_ability']
+    )
+
+def _player_record(player: Player) -> tuple:
+    """Positional arguments for the add_player statement"""
+    return (
+        player.game_id,
+        player.user_id,
+        player.role.value,
+        player.sheriff_used_shot,
+        player.detective_last_investigation,
+        player.engineer_used_ability
+    )
+
+async def _run_in_order(conn: asyncpg.Connection, writes: List[Tuple[str, tuple]]):
+    """Send named writes in order, batching runs of the same statement into one executemany"""
+    for name, group in itertools.groupby(writes, key=lambda item: item[0]):
+        await conn.executemany(STATEMENTS[name], [args for _, args in group])
+
+_current_session: ContextVar[Optional["DatabaseSession"]] = ContextVar("db_session", default=None)
+
+def _active_session() -> Optional["DatabaseSession"]:
+    session = _current_session.get()
+    return session if session is not None and session.active else None
+
+class DatabaseSession:
+    """Pinned connection plus the named writes queued during one unit of work"""
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+        self.active = True
+        self.touched: Set[Tuple[str, Any]] = set()
+        self._pending: List[Tuple[str, tuple]] = []
+
+    def queue(self, name: str, args: tuple):
+        self._pending.append((name, args))
+
+    async def flush(self):
+        pending, self._pending = self._pending, []
+        await _run_in_order(self.conn, pending)
 
 class Database:
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
         self.max_retries = 5
         self.retry_delay = 2  # seconds
+        self._schema_ready = False
+        self.game_cache = GameCache()
+        self.roster_cache = RosterCache()
+        self.user_cache = UserCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+        self.name_cache = NameCache(NAME_CACHE_SIZE)
+        # Cross-process invalidation: our NOTIFYs carry this id so the listener can skip them
+        self.instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncpg.Connection] = None
+        self._outbox: Set[Tuple[str, Any]] = set()
+        self._publisher: Optional[asyncio.Task] = None
+        self._invalidation_listeners: Dict[str, List[Callable[[Any], None]]] = {}
 
     async def connect(self):
         try:
-            self.pool = await asyncpg.create_pool(DATABASE_URL)
-            await self._create_tables()
+            # Tables must exist before the pool's connections query them.
+            # Migrations run once per process - reconnects go straight to the pool.
+            if not self._schema_ready:
+                conn = await asyncpg.connect(DATABASE_URL)
+                try:
+                    applied = await run_migrations(conn)
+                finally:
+                    await conn.close()
+                if applied:
+                    print(f"🛠️ Applied schema migrations {applied} - The ship has been retrofitted!")
+                self._schema_ready = True
+
+            # create_pool opens min_size connections up front, so they are all warm before the first update
+            self.pool = await asyncpg.create_pool(
+                DATABASE_URL,
+                min_size=DB_POOL_MIN_SIZE,
+                max_size=DB_POOL_MAX_SIZE,
+                max_inactive_connection_lifetime=DB_POOL_MAX_INACTIVE_LIFETIME,
+                init=self._init_connection
+            )
+            await self._start_listener()
         except Exception as e:
             print(f"🚨 Database connection failed! Is the server playing hide and seek? {e}")
             raise
 
     async def disconnect(self):
+        if self._publisher and not self._publisher.done():
+            await self._publisher  # Peers should still hear about our last writes
+        if self._listener:
+            self._listener.remove_termination_listener(self._on_listener_lost)
+            await self._listener.close()
+            self._listener = None
         if self.pool:
             await self.pool.close()
 
-    async def _reconnect_if_needed(self):
-        """Attempt to reconnect to database if connection is lost"""
-        if not self.pool:
-            return await self.connect()
-            
+    async def _start_listener(self):
+        """LISTEN for cache invalidations from other bot processes on a dedicated connection"""
+        if self._listener and not self._listener.is_closed():
+            return
+
+        conn = await asyncpg.connect(DATABASE_URL)
+        await conn.add_listener(CACHE_INVALIDATION_CHANNEL, self._on_invalidation)
+        conn.add_termination_listener(self._on_listener_lost)
+        self._listener = conn
+        # Anything published while we were not listening is lost, so cached state can't be trusted
+        self.clear_caches()
+
+    def _on_listener_lost(self, conn: asyncpg.Connection):
+        print("📡 Cache invalidation listener lost. Dropping cached state and reconnecting...")
+        self._listener = None
+        self.clear_caches()
+        asyncio.create_task(self._reconnect_listener())
+
+    async def _reconnect_listener(self):
+        for attempt in range(self.max_retries):
+            await asyncio.sleep(self.retry_delay * (2 ** attempt))
+            try:
+                await self._start_listener()
+                return
+            except Exception as e:
+                print(f"📡 Listener reconnection failed (attempt {attempt + 1}/{self.max_retries}): {e}")
+        print("💥 Could not re-establish the invalidation listener - cached reads may go stale!")
+
+    def _on_invalidation(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str):
         try:
-            # Test connection with a simple query
-            async with self.pool.acquire() as conn:
-                await conn.fetchval("SELECT 1")
-        except (asyncpg.exceptions.ConnectionDoesNotExistError, 
-                asyncpg.exceptions.InterfaceError,
-                asyncpg.exceptions.InternalClientError):
-            print("🔌 Database connection lost. Initiating emergency reconnection protocol...")
-            await self.disconnect()
+            message = _json_loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == self.instance_id:
+            return
+        for kind, key in message.get("keys", []):
+            self._evict(kind, key)
+
+    def add_invalidation_listener(self, kind: str, callback: Callable[[Any], None]):
+        """Call callback(key) whenever another process (or a rolled-back session) invalidates kind/key.
+
+        key is None when every entry may be stale (e.g. the listener connection was lost).
+        """
+        self._invalidation_listeners.setdefault(kind, []).append(callback)
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "games": self.game_cache.stats(),
+            "rosters": self.roster_cache.stats(),
+            "users": self.user_cache.stats(),
+        }
+
+    def clear_caches(self):
+        self.game_cache.clear()
+        self.roster_cache.clear()
+        self.user_cache.clear()
+        self.name_cache.clear()
+        for callbacks in self._invalidation_listeners.values():
+            for callback in callbacks:
+                callback(None)
+
+    async def _ensure_pool(self):
+        """Open the pool lazily - on first use or after it was torn down by a failure"""
+        if not self.pool or self.pool.is_closing():
+            print("🔌 Database pool unavailable. Initiating emergency reconnection protocol...")
             await self.connect()
 
+    async def _recover_from_connection_error(self):
+        """Recycle every pooled connection so the next acquire gets a freshly validated one"""
+        if self.pool and not self.pool.is_closing():
+            try:
+                await self.pool.expire_connections()
+            except Exception:
+                # The pool itself is broken - drop it and let _ensure_pool rebuild it
+                self.pool.terminate()
+                self.pool = None
+
+    @asynccontextmanager
+    async def session(self):
+        """Unit of work: every Database call inside shares one connection and one transaction.
+
+        Named writes are queued and flushed together (before the next read, and at exit).
+        Nested sessions join the outer one.
+        """
+        if _active_session() is not None:
+            yield _current_session.get()
+            return
+
+        await self._ensure_pool()
+        async with self.pool.acquire() as conn:
+            session = DatabaseSession(conn)
+            token = _current_session.set(session)
+            try:
+                async with conn.transaction():
+                    yield session
+                    await session.flush()
+            except BaseException:
+                # Cached state was updated ahead of the commit that never happened
+                for kind, key in session.touched:
+                    self._evict(kind, key)
+                raise
+            else:
+                self._queue_invalidations(session.touched)
+            finally:
+                # Tasks spawned inside the block inherit the contextvar, so the flag is what retires it
+                session.active = False
+                _current_session.reset(token)
+
+    def _evict(self, kind: str, key: Any):
+        if kind == "game":
+            self.game_cache.evict(key)
+        elif kind == "roster":
+            self.roster_cache.evict(key)
+        elif kind == "user":
+            self.user_cache.evict(key)
+            self.name_cache.evict(key)
+        for callback in self._invalidation_listeners.get(kind, []):
+            callback(key)
+
+    def _touch(self, kind: str, key: Any):
+        """Record a write to kind/key: published to other processes once it commits"""
+        session = _active_session()
+        if session is not None:
+            session.touched.add((kind, key))  # Held until commit, evicted locally on rollback
+        else:
+            self._queue_invalidations([(kind, key)])
+
+    def _queue_invalidations(self, keys):
+        self._outbox.update(keys)
+        if self._outbox and (self._publisher is None or self._publisher.done()):
+            self._publisher = asyncio.create_task(self._publish_invalidations())
+
+    async def _publish_invalidations(self):
+        """Coalesce invalidations for a moment, then NOTIFY them in payloads under PostgreSQL's 8000 byte limit"""
+        await asyncio.sleep(CACHE_INVALIDATION_DELAY)
+        while self._outbox:
+            batch = list(itertools.islice(self._outbox, 100))
+            self._outbox.difference_update(batch)
+            payload = _json_dumps({"origin": self.instance_id, "keys": batch})
+            try:
+                await self._ensure_pool()
+                async with self.pool.acquire() as conn:
+                    await conn.execute("SELECT pg_notify($1, $2)", CACHE_INVALIDATION_CHANNEL, payload)
+            except Exception as e:
+                print(f"📡 Failed to publish {len(batch)} cache invalidations: {e}")
+
+    def _update_cached_user(self, user_id: int, **fields):
+        self.user_cache.update(user_id, **fields)
+        self._touch("user", user_id)
+
+    def _update_cached_game(self, game_id: str, **fields):
+        self.game_cache.update(game_id, **fields)
+        self._touch("game", game_id)
+
+    def _update_cached_player(self, game_id: str, user_id: int, **fields):
+        self.roster_cache.update_player(game_id, user_id, **fields)
+        self._touch("roster", game_id)
+
+    @asynccontextmanager
+    async def _acquire(self):
+        """The active session's pinned connection, or a fresh one from the pool"""
+        session = _active_session()
+        if session is not None:
+            await session.flush()  # Reads must see writes queued earlier in the same unit of work
+            yield session.conn
+        else:
+            async with self.pool.acquire() as conn:
+                yield conn
+
+    async def _write(self, name: str, *args):
+        """Run a named write now, or queue it on the active session"""
+        session = _active_session()
+        if session is not None:
+            session.queue(name, args)
+            return
+
+        async def _run_write():
+            async with self.pool.acquire() as conn:
+                await conn.execute(STATEMENTS[name], *args)
+        
+        await self._execute_with_retry(_run_write)
+
+    async def write_batch(self, writes: List[Tuple[str, tuple]], touched: Set[Tuple[str, Any]]):
+        """Apply journaled prepared writes in one transaction, then tell other processes what changed.
+
+        The writer already updated its own in-memory state, so nothing is evicted locally.
+        """
+        async def _write_batch():
+            async with self._acquire() as conn, conn.transaction():
+                await _run_in_order(conn, writes)
+        
+        await self._execute_with_retry(_write_batch)
+        self._queue_invalidations(touched)
+
     async def _execute_with_retry(self, func, *args, **kwargs):
         """Execute a database operation with retry logic"""
+        if _active_session() is not None:
+            # A broken transaction cannot be retried piecemeal - let the session fail as a whole
+            return await func(*args, **kwargs)
+
         last_exception = None
         
         for attempt in range(self.max_retries):
             try:
-                await self._reconnect_if_needed()
+                await self._ensure_pool()
                 return await func(*args, **kwargs)
-            except (asyncpg.exceptions.ConnectionDoesNotExistError, 
-                    asyncpg.exceptions.InterfaceError,
-                    asyncpg.exceptions.InternalClientError) as e:
+            except CONNECTION_ERRORS as e:
                 last_exception = e
+                await self._recover_from_connection_error()
                 if attempt < self.max_retries - 1:
                     print(f"⚡ Database connection error (attempt {attempt + 1}/{self.max_retries}): {e} - Retrying because failure is not an option!")
                     await asyncio.sleep(self.retry_delay * (2 ** attempt))  # Exponential backoff
@@ -65,81 +433,29 @@ class Database:
         
         raise last_exception
 
-    async def _create_tables(self):
-        async with self.pool.acquire() as conn:
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id BIGINT PRIMARY KEY,
-                    xp INTEGER DEFAULT 0,
-                    is_banned BOOLEAN DEFAULT FALSE,
-                    ban_expiry TIMESTAMP,
-                    streak INTEGER DEFAULT 0,
-                    achievements JSONB DEFAULT '{}'
-                )
-            """)
-            
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS games (
-                    id TEXT PRIMARY KEY,
-                    mode TEXT NOT NULL,
-                    group_id BIGINT NOT NULL,
-                    phase TEXT NOT NULL,
-                    start_time TIMESTAMP NOT NULL,
-                    end_time TIMESTAMP,
-                    creator_id BIGINT NOT NULL,
-                    failed_task_rounds INTEGER DEFAULT 0,
-                    settings JSONB DEFAULT '{}'
-                )
-            """)
-            
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS players (
-                    game_id TEXT NOT NULL,
-                    user_id BIGINT NOT NULL,
-                    role TEXT NOT NULL,
-                    is_alive BOOLEAN DEFAULT TRUE,
-                    voted BOOLEAN DEFAULT FALSE,
-                    completed_task BOOLEAN DEFAULT FALSE,
-                    sheriff_used_shot BOOLEAN DEFAULT FALSE,
-                    detective_last_investigation INTEGER DEFAULT 0,
-                    engineer_used_ability BOOLEAN DEFAULT FALSE,
-                    PRIMARY KEY (game_id, user_id)
-                )
-            """)
-            
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS bans (
-                    user_id BIGINT PRIMARY KEY,
-                    start_time TIMESTAMP NOT NULL,
-                    duration TEXT,
-                    reason TEXT NOT NULL
-                )
-            """)
-            
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS votes (
-                    game_id TEXT NOT NULL,
-                    voter_id BIGINT NOT NULL,
-                    target_id BIGINT,
-                    round_number INTEGER NOT NULL,
-                    timestamp TIMESTAMP DEFAULT NOW(),
-                    PRIMARY KEY (game_id, voter_id, round_number)
-                )
-            """)
+    async def _init_connection(self, conn: asyncpg.Connection):
+        """Register JSON codecs when a connection joins the pool"""
+        # Cached statements capture the codecs in effect when they are prepared, so these go first
+        for json_type in ("json", "jsonb"):
+            await conn.set_type_codec(
+                json_type,
+                encoder=_json_dumps,
+                decoder=_json_loads,
+                schema="pg_catalog"
+            )
 
     async def get_user(self, user_id: int) -> Optional[User]:
+        cached = self.user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
         async def _get_user():
-            async with self.pool.acquire() as conn:
+            async with self._acquire() as conn:
                 row = await conn.fetchrow("SELECT * FROM users WHERE id = $1", user_id)
                 if row:
-                    return User(
-                        id=row['id'],
-                        xp=row['xp'],
-                        is_banned=row['is_banned'],
-                        ban_expiry=row['ban_expiry'],
-                        streak=row['streak'],
-                        achievements=row['achievements'] or {}
-                    )
+                    user = _user_from_row(row)
+                    self.user_cache.put(user)
+                    return user
                 return None
         
         try:
@@ -150,7 +466,7 @@ class Database:
 
     async def create_user(self, user_id: int) -> User:
         async def _create_user():
-            async with self.pool.acquire() as conn:
+            async with self._acquire() as conn:
                 await conn.execute(
                     "INSERT INTO users (id) VALUES ($1) ON CONFLICT (id) DO NOTHING",
                     user_id
@@ -161,74 +477,191 @@ class Database:
 
     async def update_user_xp(self, user_id: int, xp_change: int):
         async def _update_user_xp():
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    "UPDATE users SET xp = xp + $1 WHERE id = $2",
+            async with self._acquire() as conn:
+                xp = await conn.fetchval(
+                    "UPDATE users SET xp = xp + $1 WHERE id = $2 RETURNING xp",
                     xp_change, user_id
                 )
+                if xp is not None:
+                    self._update_cached_user(user_id, xp=xp)
         
         await self._execute_with_retry(_update_user_xp)
 
     async def update_user_streak(self, user_id: int, streak: int):
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE users SET streak = $1 WHERE id = $2",
-                streak, user_id
-            )
+        async def _update_user_streak():
+            async with self._acquire() as conn:
+                await conn.execute(
+                    "UPDATE users SET streak = $1 WHERE id = $2",
+                    streak, user_id
+                )
+                self._update_cached_user(user_id, streak=streak)
+        
+        await self._execute_with_retry(_update_user_streak)
 
     async def set_user_xp(self, user_id: int, xp: int):
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE users SET xp = $1 WHERE id = $2",
-                xp, user_id
-            )
+        async def _set_user_xp():
+            async with self._acquire() as conn:
+                await conn.execute(
+                    "UPDATE users SET xp = $1 WHERE id = $2",
+                    xp, user_id
+                )
+                self._update_cached_user(user_id, xp=xp)
+        
+        await self._execute_with_retry(_set_user_xp)
 
-    async def ban_user(self, user_id: int, duration: Optional[str], reason: str):
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "INSERT INTO bans (user_id, start_time, duration, reason) VALUES ($1, $2, $3, $4) ON CONFLICT (user_id) DO UPDATE SET start_time = $2, duration = $3, reason = $4",
-                user_id, datetime.now(), duration, reason
-            )
-            await conn.execute(
-                "UPDATE users SET is_banned = TRUE WHERE id = $1",
-                user_id
-            )
+    async def ban_user(self, user_id: int, duration: Optional[str], reason: str,
+                       expires_at: Optional[datetime] = None):
+        async def _ban_user():
+            async with self._acquire() as conn, conn.transaction():
+                await conn.execute(
+                    "INSERT INTO bans (user_id, start_time, duration, reason, expires_at) VALUES ($1, $2, $3, $4, $5) ON CONFLICT (user_id) DO UPDATE SET start_time = $2, duration = $3, reason = $4, expires_at = $5",
+                    user_id, datetime.now(), duration, reason, expires_at
+                )
+                await conn.execute(
+                    "INSERT INTO users (id, is_banned, ban_expiry) VALUES ($1, TRUE, $2) ON CONFLICT (id) DO UPDATE SET is_banned = TRUE, ban_expiry = $2",
+                    user_id, expires_at
+                )
+        
+        await self._execute_with_retry(_ban_user)
+        self._update_cached_user(user_id, is_banned=True, ban_expiry=expires_at)
+        self._touch("ban", user_id)
 
     async def unban_user(self, user_id: int):
-        async with self.pool.acquire() as conn:
-            await conn.execute("DELETE FROM bans WHERE user_id = $1", user_id)
-            await conn.execute(
-                "UPDATE users SET is_banned = FALSE, ban_expiry = NULL WHERE id = $1",
-                user_id
-            )
+        async def _unban_user():
+            async with self._acquire() as conn, conn.transaction():
+                await conn.execute("DELETE FROM bans WHERE user_id = $1", user_id)
+                await conn.execute(
+                    "UPDATE users SET is_banned = FALSE, ban_expiry = NULL WHERE id = $1",
+                    user_id
+                )
+        
+        await self._execute_with_retry(_unban_user)
+        self._update_cached_user(user_id, is_banned=False, ban_expiry=None)
+        self._touch("ban", user_id)
+
+    async def lift_expired_ban(self, user_id: int, now: datetime) -> bool:
+        """Remove a timed ban only if it has run out; False if it was already lifted or extended"""
+        async def _lift_expired_ban():
+            async with self._acquire() as conn, conn.transaction():
+                lifted = await conn.fetchval(
+                    "DELETE FROM bans WHERE user_id = $1 AND expires_at <= $2 RETURNING user_id",
+                    user_id, now
+                )
+                if lifted is not None:
+                    await conn.execute(
+                        "UPDATE users SET is_banned = FALSE, ban_expiry = NULL WHERE id = $1",
+                        user_id
+                    )
+                return lifted is not None
+        
+        lifted = await self._execute_with_retry(_lift_expired_ban)
+        if lifted:
+            self._update_cached_user(user_id, is_banned=False, ban_expiry=None)
+            self._touch("ban", user_id)
+        return lifted
+
+    async def remember_display_name(self, user_id: int, name: str):
+        """Store a name seen on an incoming update; only reaches PostgreSQL when it is new or changed"""
+        if self.name_cache.get(user_id) == name:
+            return
+
+        async def _remember_display_name():
+            async with self._acquire() as conn:
+                return await conn.fetchval(
+                    "INSERT INTO users (id, display_name) VALUES ($1, $2) ON CONFLICT (id) DO UPDATE SET display_name = $2 WHERE users.display_name IS DISTINCT FROM $2 RETURNING id",
+                    user_id, name
+                )
+        
+        changed = await self._execute_with_retry(_remember_display_name)
+        self.name_cache.put(user_id, name)
+        if changed is not None:
+            self._update_cached_user(user_id, display_name=name)
+
+    async def get_display_names(self, user_ids: List[int]) -> Dict[int, str]:
+        """Names for every user that has one, with a single query for whatever isn't cached"""
+        names, missing = self.name_cache.get_many(user_ids)
+        if not missing:
+            return names
+
+        async def _get_display_names():
+            async with self._acquire() as conn:
+                return await conn.fetch(
+                    "SELECT id, display_name FROM users WHERE id = ANY($1::BIGINT[])",
+                    missing
+                )
+        
+        try:
+            rows = await self._execute_with_retry(_get_display_names)
+        except Exception as e:
+            print(f"🏷️ Error resolving display names: {e} - Everyone is anonymous today!")
+            return names
+
+        stored = {row['id']: row['display_name'] for row in rows}
+        for user_id in missing:
+            name = stored.get(user_id)
+            self.name_cache.put(user_id, name)
+            if name:
+                names[user_id] = name
+        return names
+
+    async def get_bans(self) -> List[Ban]:
+        async def _get_bans():
+            async with self._acquire() as conn:
+                rows = await conn.fetch("SELECT * FROM bans")
+                return [_ban_from_row(row) for row in rows]
+        
+        return await self._execute_with_retry(_get_bans)
+
+    async def get_ban(self, user_id: int) -> Optional[Ban]:
+        async def _get_ban():
+            async with self._acquire() as conn:
+                row = await conn.fetchrow("SELECT * FROM bans WHERE user_id = $1", user_id)
+                return _ban_from_row(row) if row else None
+        
+        return await self._execute_with_retry(_get_ban)
+
+    async def merge_user_achievements(self, user_id: int, achievements: Dict[str, Any]):
+        """Merge keys into the user's achievements JSONB without a read-modify-write round trip"""
+        async def _merge_user_achievements():
+            async with self._acquire() as conn:
+                merged = await conn.fetchval(
+                    "UPDATE users SET achievements = achievements || $1 WHERE id = $2 RETURNING achievements",
+                    achievements, user_id
+                )
+                if merged is not None:
+                    self._update_cached_user(user_id, achievements=merged)
+        
+        await self._execute_with_retry(_merge_user_achievements)
 
     async def create_game(self, game: Game) -> Game:
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "INSERT INTO games (id, mode, group_id, phase, start_time, creator_id, failed_task_rounds, settings) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)",
-                game.id, game.mode.value, game.group_id, game.phase.value, game.start_time, game.creator_id, game.failed_task_rounds, json.dumps(game.settings)
-            )
-            return game
+        async def _create_game():
+            async with self._acquire() as conn:
+                await conn.execute(
+                    "INSERT INTO games (id, mode, group_id, phase, start_time, creator_id, failed_task_rounds, settings) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)",
+                    game.id, game.mode.value, game.group_id, game.phase.value, game.start_time, game.creator_id, game.failed_task_rounds, game.settings
+                )
+                return game
+        
+        await self._execute_with_retry(_create_game)
+        self.game_cache.put(game)
+        self._touch("game", game.id)
+        return game
 
     async def get_game_by_group(self, group_id: int) -> Optional[Game]:
+        cached = self.game_cache.get_by_group(group_id)
+        if cached:
+            return cached
+
         async def _get_game_by_group():
-            async with self.pool.acquire() as conn:
+            async with self._acquire() as conn:
                 row = await conn.fetchrow(
                     "SELECT * FROM games WHERE group_id = $1 AND phase != 'ended' ORDER BY start_time DESC LIMIT 1",
                     group_id
                 )
                 if row:
-                    return Game(
-                        id=row['id'],
-                        mode=GameMode(row['mode']),
-                        group_id=row['group_id'],
-                        phase=GamePhase(row['phase']),
-                        start_time=row['start_time'],
-                        end_time=row['end_time'],
-                        creator_id=row['creator_id'],
-                        failed_task_rounds=row['failed_task_rounds'],
-                        settings=row['settings'] or {}
-                    )
+                    game = _game_from_row(row)
+                    self.game_cache.put(game)
+                    return game
                 return None
         
         try:
@@ -239,24 +672,20 @@ class Database:
 
     async def get_game_by_id(self, game_id: str) -> Optional[Game]:
         """Get game by its ID instead of group ID"""
+        cached = self.game_cache.get(game_id)
+        if cached:
+            return cached
+
         async def _get_game_by_id():
-            async with self.pool.acquire() as conn:
+            async with self._acquire() as conn:
                 row = await conn.fetchrow(
                     "SELECT * FROM games WHERE id = $1",
                     game_id
                 )
                 if row:
-                    return Game(
-                        id=row['id'],
-                        mode=GameMode(row['mode']),
-                        group_id=row['group_id'],
-                        phase=GamePhase(row['phase']),
-                        start_time=row['start_time'],
-                        end_time=row['end_time'],
-                        creator_id=row['creator_id'],
-                        failed_task_rounds=row['failed_task_rounds'],
-                        settings=row['settings'] or {}
-                    )
+                    game = _game_from_row(row)
+                    self.game_cache.put(game)
+                    return game
                 return None
         
         try:
@@ -265,230 +694,155 @@ class Database:
             print(f"🆔 Error getting game by ID {game_id}: {e} - Game ID seems to be an illusion!")
             return None
 
-    async def update_game_phase(self, game_id: str, phase: GamePhase):
-        async def _update_game_phase():
-            async with self.pool.acquire() as conn:
+    async def write_game_snapshot(self, game: Game, players: List[Player], votes: Dict[int, Optional[int]]):
+        """Overwrite a game's row, roster flags and current-round votes with in-memory state in one transaction"""
+        async def _write_game_snapshot():
+            async with self._acquire() as conn, conn.transaction():
                 await conn.execute(
-                    "UPDATE games SET phase = $1 WHERE id = $2",
-                    phase.value, game_id
+                    "UPDATE games SET phase = $1, round_number = $2, failed_task_rounds = $3 WHERE id = $4",
+                    game.phase.value, game.round_number, game.failed_task_rounds, game.id
+                )
+                await conn.executemany(
+                    "UPDATE players SET is_alive = $3, voted = $4, completed_task = $5, sheriff_used_shot = $6, detective_last_investigation = $7, engineer_used_ability = $8 WHERE game_id = $1 AND user_id = $2",
+                    [(p.game_id, p.user_id, p.is_alive, p.voted, p.completed_task, p.sheriff_used_shot,
+                      p.detective_last_investigation, p.engineer_used_ability) for p in players]
+                )
+                await conn.executemany(
+                    STATEMENTS["record_vote"],
+                    [(game.id, voter_id, target_id, game.round_number) for voter_id, target_id in votes.items()]
                 )
         
-        await self._execute_with_retry(_update_game_phase)
+        await self._execute_with_retry(_write_game_snapshot)
+        self._queue_invalidations([("game", game.id), ("roster", game.id)])
 
     async def end_game(self, game_id: str):
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE games SET phase = 'ended', end_time = $1 WHERE id = $2",
-                datetime.now(), game_id
-            )
-
-    async def increment_failed_rounds(self, game_id: str):
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE games SET failed_task_rounds = failed_task_rounds + 1 WHERE id = $1",
-                game_id
-            )
-
-    async def add_player(self, player: Player):
-        async def _add_player():
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    "INSERT INTO players (game_id, user_id, role, sheriff_used_shot, detective_last_investigation, engineer_used_ability) VALUES ($1, $2, $3, $4, $5, $6)",
-                    player.game_id, player.user_id, player.role.value, player.sheriff_used_shot, player.detective_last_investigation, player.engineer_used_ability
-                )
+        async def _end_game():
+            async with self._acquire() as conn:
+                await conn.execute(STATEMENTS["end_game"], datetime.now(), game_id)
+        
+        await self._execute_with_retry(_end_game)
+        self.game_cache.evict(game_id)
+        self.roster_cache.evict(game_id)
+        self._touch("game", game_id)
+        self._touch("roster", game_id)
+
+    async def add_players(self, game_id: str, players: List[Player], phase: Optional[GamePhase] = None):
+        """Insert a whole roster (and optionally move the game to a new phase) in one transaction"""
+        async def _add_players():
+            async with self._acquire() as conn:
+                async with conn.transaction():
+                    await conn.executemany(STATEMENTS["add_player"], [_player_record(p) for p in players])
+                    if phase is not None:
+                        await conn.execute(STATEMENTS["update_game_phase"], phase.value, game_id)
         
-        await self._execute_with_retry(_add_player)
+        await self._execute_with_retry(_add_players)
+        self.roster_cache.put(game_id, players)
+        self._touch("roster", game_id)
+        if phase is not None:
+            self._update_cached_game(game_id, phase=phase)
+
+    async def _get_roster(self, game_id: str) -> Dict[int, Player]:
+        """Every player of a game keyed by user id - one query per game, then served from memory"""
+        roster = self.roster_cache.get(game_id)
+        if roster is not None:
+            return roster
+
+        async def _fetch_roster():
+            async with self._acquire() as conn:
+                rows = await conn.fetch(STATEMENTS["get_players"], game_id)
+                return [_player_from_row(row) for row in rows]
+        
+        players = await self._execute_with_retry(_fetch_roster)
+        if not players:
+            # Lobbies and unknown ids have no rows - not worth holding on to
+            return {}
+        return self.roster_cache.put(game_id, players)
 
     async def get_player(self, game_id: str, user_id: int) -> Optional[Player]:
-        async def _get_player():
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow(
-                    "SELECT * FROM players WHERE game_id = $1 AND user_id = $2",
-                    game_id, user_id
-                )
-                if row:
-                    return Player(
-                        game_id=row['game_id'],
-                        user_id=row['user_id'],
-                        role=Role(row['role']),
-                        is_alive=row['is_alive'],
-                        voted=row['voted'],
-                        completed_task=row['completed_task'],
-                        sheriff_used_shot=row['sheriff_used_shot'],
-                        detective_last_investigation=row['detective_last_investigation'],
-                        engineer_used_ability=row['engineer_used_ability']
-                    )
-                return None
-        
         try:
-            return await self._execute_with_retry(_get_player)
+            return (await self._get_roster(game_id)).get(user_id)
         except Exception as e:
             print(f"👥 Error getting player {user_id} in game {game_id}: {e} - Player playing hide and seek?")
             return None
 
     async def get_players(self, game_id: str) -> List[Player]:
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT * FROM players WHERE game_id = $1",
-                game_id
-            )
-            return [
-                Player(
-                    game_id=row['game_id'],
-                    user_id=row['user_id'],
-                    role=Role(row['role']),
-                    is_alive=row['is_alive'],
-                    voted=row['voted'],
-                    completed_task=row['completed_task'],
-                    sheriff_used_shot=row['sheriff_used_shot'],
-                    detective_last_investigation=row['detective_last_investigation'],
-                    engineer_used_ability=row['engineer_used_ability']
-                )
-                for row in rows
-            ]
+        return list((await self._get_roster(game_id)).values())
 
     async def get_alive_players(self, game_id: str) -> List[Player]:
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT * FROM players WHERE game_id = $1 AND is_alive = TRUE",
-                game_id
-            )
-            return [
-                Player(
-                    game_id=row['game_id'],
-                    user_id=row['user_id'],
-                    role=Role(row['role']),
-                    is_alive=row['is_alive'],
-                    voted=row['voted'],
-                    completed_task=row['completed_task'],
-                    sheriff_used_shot=row['sheriff_used_shot'],
-                    detective_last_investigation=row['detective_last_investigation'],
-                    engineer_used_ability=row['engineer_used_ability']
-                )
-                for row in rows
-            ]
-
-    async def get_players_by_role(self, game_id: str, role: Role) -> List[Player]:
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT * FROM players WHERE game_id = $1 AND role = $2",
-                game_id, role.value
-            )
-            return [
-                Player(
-                    game_id=row['game_id'],
-                    user_id=row['user_id'],
-                    role=Role(row['role']),
-                    is_alive=row['is_alive'],
-                    voted=row['voted'],
-                    completed_task=row['completed_task'],
-                    sheriff_used_shot=row['sheriff_used_shot'],
-                    detective_last_investigation=row['detective_last_investigation'],
-                    engineer_used_ability=row['engineer_used_ability']
-                )
-                for row in rows
-            ]
+        return [p for p in (await self._get_roster(game_id)).values() if p.is_alive]
 
     async def update_player_field(self, game_id: str, user_id: int, field: str, value: Any):
-        async def _update_player_field():
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    f"UPDATE players SET {field} = $1 WHERE game_id = $2 AND user_id = $3",
-                    value, game_id, user_id
-                )
-        
-        await self._execute_with_retry(_update_player_field)
+        if field not in PLAYER_FIELDS:
+            raise ValueError(f"Unknown player field: {field}")
+
+        await self._write(f"update_player_{field}", value, game_id, user_id)
+        self._update_cached_player(game_id, user_id, **{field: value})
 
     async def get_player_field(self, game_id: str, user_id: int, field: str) -> Any:
         """Get a specific field value for a player"""
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                f"SELECT {field} FROM players WHERE game_id = $1 AND user_id = $2",
-                game_id, user_id
-            )
-            return row[field] if row else None
+        player = await self.get_player(game_id, user_id)
+        return getattr(player, field) if player else None
 
     async def kill_player(self, game_id: str, user_id: int):
         await self.update_player_field(game_id, user_id, "is_alive", False)
 
-    async def mark_voted(self, game_id: str, user_id: int):
-        await self.update_player_field(game_id, user_id, "voted", True)
-
-    async def reset_votes(self, game_id: str):
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE players SET voted = FALSE WHERE game_id = $1",
-                game_id
-            )
-
-    async def reset_tasks(self, game_id: str):
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE players SET completed_task = FALSE WHERE game_id = $1",
-                game_id
-            )
-
-    async def get_voters_for_target(self, game_id: str, target_id: int) -> List[int]:
-        """Get list of users who voted for a specific target"""
-        # This would need a votes table to track individual votes
-        # For now, this is a placeholder that should be implemented
-        # when you add proper vote tracking
-        async with self.pool.acquire() as conn:
-            # This assumes you'll add a votes table later
-            # For now, return empty list
-            return []
-
-    async def get_game_round(self, game_id: str) -> int:
-        """Get current round number for a game"""
-        async with self.pool.acquire() as conn:
-            # You might want to add a round_number field to games table
-            # For now, calculate based on game duration or add to game settings
-            row = await conn.fetchrow(
-                "SELECT settings FROM games WHERE id = $1",
-                game_id
-            )
-            if row and row['settings']:
-                return row['settings'].get('round_number', 1)
-            return 1
-
-    async def update_game_settings(self, game_id: str, settings: Dict[str, Any]):
-        """Update game settings JSON field"""
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE games SET settings = $1 WHERE id = $2",
-                json.dumps(settings), game_id
-            )
-
-    async def create_votes_table(self):
-        """Add this to your _create_tables method"""
-        async with self.pool.acquire() as conn:
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS votes (
-                    game_id TEXT NOT NULL,
-                    voter_id BIGINT NOT NULL,
-                    target_id BIGINT,
-                    round_number INTEGER NOT NULL,
-                    timestamp TIMESTAMP DEFAULT NOW(),
-                    PRIMARY KEY (game_id, voter_id, round_number)
+    async def archive_ended_games(self, ended_before: datetime, batch_size: int) -> int:
+        """Move one chunk of ended games (with their players and votes) to the archive tables"""
+        async def _archive_ended_games():
+            async with self._acquire() as conn:
+                # A single statement, so each chunk is moved atomically
+                return await conn.fetchval(
+                    """
+                    WITH batch AS (
+                        SELECT id FROM games
+                        WHERE phase = 'ended' AND end_time < $1
+                        ORDER BY end_time
+                        LIMIT $2
+                        FOR UPDATE SKIP LOCKED
+                    ), moved_votes AS (
+                        DELETE FROM votes WHERE game_id IN (SELECT id FROM batch)
+                        RETURNING votes.*
+                    ), archived_votes AS (
+                        INSERT INTO votes_archive SELECT * FROM moved_votes
+                    ), moved_players AS (
+                        DELETE FROM players WHERE game_id IN (SELECT id FROM batch)
+                        RETURNING players.*
+                    ), archived_players AS (
+                        INSERT INTO players_archive SELECT * FROM moved_players
+                    ), moved_games AS (
+                        DELETE FROM games WHERE id IN (SELECT id FROM batch)
+                        RETURNING games.*
+                    ), archived_games AS (
+                        INSERT INTO games_archive SELECT * FROM moved_games
+                        RETURNING id
+                    )
+                    SELECT COUNT(*) FROM archived_games
+                    """,
+                    ended_before, batch_size
                 )
-            """)
-
-    async def record_vote(self, game_id: str, voter_id: int, target_id: Optional[int], round_number: int):
-        """Record a player's vote"""
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "INSERT INTO votes (game_id, voter_id, target_id, round_number) VALUES ($1, $2, $3, $4) ON CONFLICT (game_id, voter_id, round_number) DO UPDATE SET target_id = $3",
-                game_id, voter_id, target_id, round_number
-            )
-
-    async def get_vote_results(self, game_id: str, round_number: int) -> Dict[int, int]:
-        """Get vote counts for current round"""
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT target_id, COUNT(*) as vote_count FROM votes WHERE game_id = $1 AND round_number = $2 GROUP BY target_id",
-                game_id, round_number
-            )
-            return {row['target_id'] or -1: row['vote_count'] for row in rows}  # -1 for skip votes    # For now, return empty list
-        return []
+        
+        return await self._execute_with_retry(_archive_ended_games)
+
+    async def purge_archived_votes(self, cast_before: datetime, batch_size: int) -> int:
+        """Delete one chunk of archived votes older than the retention window"""
+        async def _purge_archived_votes():
+            async with self._acquire() as conn:
+                return await conn.fetchval(
+                    """
+                    WITH purged AS (
+                        DELETE FROM votes_archive
+                        WHERE ctid IN (
+                            SELECT ctid FROM votes_archive
+                            WHERE timestamp < $1
+                            LIMIT $2
+                        )
+                        RETURNING 1
+                    )
+                    SELECT COUNT(*) FROM purged
+                    """,
+                    cast_before, batch_size
+                )
+        
+        return await self._execute_with_retry(_purge_archived_votes)
 
 db = Database()
\ No newline at end of file
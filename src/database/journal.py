@@ -0,0 +1,88 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, List, Optional, Set, Tuple
+from src.utils.config import JOURNAL_FLUSH_DELAY, JOURNAL_BATCH_SIZE, JOURNAL_DRAIN_TIMEOUT
+from src.database.connection import db, _current_session, CONNECTION_ERRORS
+
+class WriteBehindJournal:
+    """Ordered queue of prepared writes for state that is authoritative in memory.
+
+    Writers update their objects first and append the matching statement here; a
+    background task applies the entries to PostgreSQL in order, one transaction per
+    batch. Nothing that decides game rules waits on it.
+    """
+
+    def __init__(self):
+        # Groups of (statement name, args, invalidation key); a group is never split across transactions
+        self._entries: Deque[List[Tuple[str, tuple, Tuple[str, Any]]]] = deque()
+        self._flusher: Optional[asyncio.Task] = None
+        # Games with writes PostgreSQL refused; their rows are rewritten from memory when they end
+        self._dirty: Set[str] = set()
+
+    def append(self, name: str, args: tuple, touched: Tuple[str, Any]):
+        self.append_group([(name, args, touched)])
+
+    def append_group(self, entries: List[Tuple[str, tuple, Tuple[str, Any]]]):
+        """Queue writes that must commit together"""
+        self._entries.append(entries)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def take_dirty(self, game_id: str) -> bool:
+        """True (once) if some of the game's writes were refused and its rows need a snapshot"""
+        if game_id in self._dirty:
+            self._dirty.discard(game_id)
+            return True
+        return False
+
+    async def drain(self, timeout: float = JOURNAL_DRAIN_TIMEOUT) -> bool:
+        """Wait until everything appended so far has reached PostgreSQL; False if it is still queued after timeout"""
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except asyncio.TimeoutError:
+            # The flusher keeps retrying in the background; callers must not wait on an outage
+            games = {key for group in self._entries for _, _, (kind, key) in group if kind in ("game", "roster")}
+            print(f"⏳ Journal still holds {len(self._entries)} write groups after {timeout}s - Games {sorted(games)} are not written yet!")
+            return False
+        return True
+
+    async def _drain(self):
+        # _flush pops a batch before writing it, so a running flusher may still hold writes
+        while self._entries or (self._flusher is not None and not self._flusher.done()):
+            if self._flusher is None or self._flusher.done():
+                self._flusher = asyncio.create_task(self._flush())
+            await asyncio.shield(self._flusher)
+
+    async def _flush(self):
+        # Spawned from handlers, so detach from whatever unit of work they had open
+        _current_session.set(None)
+        await asyncio.sleep(JOURNAL_FLUSH_DELAY)
+        failures = 0
+        while self._entries:
+            batch = [self._entries.popleft()]
+            size = len(batch[0])
+            while self._entries and size + len(self._entries[0]) <= JOURNAL_BATCH_SIZE:
+                size += len(self._entries[0])
+                batch.append(self._entries.popleft())
+            writes = [(name, args) for group in batch for name, args, _ in group]
+            touched = {key for group in batch for _, _, key in group}
+            try:
+                await db.write_batch(writes, touched)
+                failures = 0
+            except CONNECTION_ERRORS as e:
+                # Keep the batch at the head so later writes still land after it
+                self._entries.extendleft(reversed(batch))
+                failures += 1
+                print(f"📒 Journal flush failed ({len(self._entries)} write groups waiting): {e} - Holding them until the database is back!")
+                await asyncio.sleep(db.retry_delay * min(2 ** failures, 32))
+            except Exception as e:
+                # PostgreSQL rejected the writes themselves; retrying would block every game behind
+                # them, so mark the games for a full snapshot from memory instead
+                games = {key for kind, key in touched if kind in ("game", "roster")}
+                self._dirty.update(games)
+                print(f"💥 PostgreSQL refused {len(writes)} journaled writes: {e} - Games {sorted(games)} will be rewritten from memory when they end!")
+
+journal = WriteBehindJournal()
@@ -0,0 +1,153 @@
+import asyncpg
+from typing import List, Tuple
+
+# Key for pg_advisory_lock so several bot processes starting together migrate one at a time
+MIGRATION_LOCK_ID = 7_201_994_001
+
+# Ordered schema history: (version, description, statements).
+# Never edit an applied migration - append a new one instead.
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "initial schema", [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id BIGINT PRIMARY KEY,
+            xp INTEGER DEFAULT 0,
+            is_banned BOOLEAN DEFAULT FALSE,
+            ban_expiry TIMESTAMP,
+            streak INTEGER DEFAULT 0,
+            achievements JSONB DEFAULT '{}'
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS games (
+            id TEXT PRIMARY KEY,
+            mode TEXT NOT NULL,
+            group_id BIGINT NOT NULL,
+            phase TEXT NOT NULL,
+            start_time TIMESTAMP NOT NULL,
+            end_time TIMESTAMP,
+            creator_id BIGINT NOT NULL,
+            failed_task_rounds INTEGER DEFAULT 0,
+            settings JSONB DEFAULT '{}'
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS players (
+            game_id TEXT NOT NULL,
+            user_id BIGINT NOT NULL,
+            role TEXT NOT NULL,
+            is_alive BOOLEAN DEFAULT TRUE,
+            voted BOOLEAN DEFAULT FALSE,
+            completed_task BOOLEAN DEFAULT FALSE,
+            sheriff_used_shot BOOLEAN DEFAULT FALSE,
+            detective_last_investigation INTEGER DEFAULT 0,
+            engineer_used_ability BOOLEAN DEFAULT FALSE,
+            PRIMARY KEY (game_id, user_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS bans (
+            user_id BIGINT PRIMARY KEY,
+            start_time TIMESTAMP NOT NULL,
+            duration TEXT,
+            reason TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS votes (
+            game_id TEXT NOT NULL,
+            voter_id BIGINT NOT NULL,
+            target_id BIGINT,
+            round_number INTEGER NOT NULL,
+            timestamp TIMESTAMP DEFAULT NOW(),
+            PRIMARY KEY (game_id, voter_id, round_number)
+        )
+        """,
+    ]),
+    (2, "hot path indexes", [
+        # The partial index only covers live games, so the per-group lookup
+        # stays small no matter how many lobbies have ended.
+        """
+        CREATE INDEX IF NOT EXISTS idx_games_active_group
+        ON games (group_id, start_time DESC)
+        WHERE phase <> 'ended'
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_players_game_role
+        ON players (game_id, role)
+        """,
+        # target_id is included so the per-round tally is an index-only scan
+        """
+        CREATE INDEX IF NOT EXISTS idx_votes_game_round
+        ON votes (game_id, round_number, target_id)
+        """,
+    ]),
+    (3, "round number column", [
+        "ALTER TABLE games ADD COLUMN IF NOT EXISTS round_number INTEGER NOT NULL DEFAULT 1",
+        # Earlier builds kept the round inside settings
+        """
+        UPDATE games SET round_number = (settings->>'round_number')::INTEGER
+        WHERE settings ? 'round_number'
+        """,
+        "UPDATE games SET settings = settings - 'round_number' - 'failed_task_rounds'",
+    ]),
+    # Ended games are moved here in chunks by Database.archive_ended_games.
+    # Archive tables mirror the hot tables column-for-column, so any later
+    # ADD COLUMN on games/players/votes must be repeated on the *_archive table.
+    (4, "archive tables", [
+        "CREATE TABLE IF NOT EXISTS games_archive (LIKE games INCLUDING DEFAULTS)",
+        "CREATE TABLE IF NOT EXISTS players_archive (LIKE players INCLUDING DEFAULTS)",
+        "CREATE TABLE IF NOT EXISTS votes_archive (LIKE votes INCLUDING DEFAULTS)",
+        "CREATE INDEX IF NOT EXISTS idx_games_archive_id ON games_archive (id)",
+        "CREATE INDEX IF NOT EXISTS idx_players_archive_game ON players_archive (game_id)",
+        "CREATE INDEX IF NOT EXISTS idx_votes_archive_timestamp ON votes_archive (timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_games_ended ON games (end_time) WHERE phase = 'ended'",
+    ]),
+    (5, "ban expiry", [
+        "ALTER TABLE bans ADD COLUMN IF NOT EXISTS expires_at TIMESTAMP",
+        """
+        UPDATE bans SET expires_at = users.ban_expiry
+        FROM users WHERE users.id = bans.user_id
+        """,
+    ]),
+    (6, "user display names", [
+        "ALTER TABLE users ADD COLUMN IF NOT EXISTS display_name TEXT",
+    ]),
+    # Rosters and vote tallies are read from the in-memory GameSession now, so
+    # nothing queries players by role or tallies votes in PostgreSQL any more.
+    (7, "drop unused roster and vote indexes", [
+        "DROP INDEX IF EXISTS idx_players_game_role",
+        "DROP INDEX IF EXISTS idx_votes_game_round",
+    ]),
+]
+
+async def run_migrations(conn: asyncpg.Connection) -> List[int]:
+    """Apply every migration newer than the recorded schema version, each in its own transaction"""
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+    try:
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+        """)
+        current = await conn.fetchval("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+
+        applied = []
+        for version, description, statements in MIGRATIONS:
+            if version <= current:
+                continue
+
+            async with conn.transaction():
+                for statement in statements:
+                    await conn.execute(statement)
+                await conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES ($1, $2)",
+                    version, description
+                )
+            applied.append(version)
+
+        return applied
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
@@ -28,6 +28,7 @@ class User(BaseModel):
     ban_expiry: Optional[datetime] = None
     streak: int = 0
     achievements: Dict[str, bool] = {}
+    display_name: Optional[str] = None
 
 class Game(BaseModel):
     id: str
@@ -38,6 +39,7 @@ class Game(BaseModel):
     end_time: Optional[datetime] = None
     creator_id: int
     failed_task_rounds: int = 0
+    round_number: int = 1
     settings: Dict[str, Any] = {}
 
 class Player(BaseModel):
@@ -55,4 +57,5 @@ class Ban(BaseModel):
     user_id: int
     start_time: datetime
     duration: Optional[str]
-    reason: str
\ No newline at end of file
+    reason: str
+    expires_at: Optional[datetime] = None
@@ -0,0 +1,257 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set, Tuple
+from src.database.models import Game, GamePhase, Player, Role
+from src.database.connection import PLAYER_FIELDS
+from src.database.journal import journal
+from src.game.roster_bits import RosterBits
+
+class GameSession:
+    """Authoritative in-memory state of one live game.
+
+    Roster, roles, votes, night actions, tasks and round counters live here and are
+    read synchronously. Every mutation updates memory first and appends the matching
+    write to the journal, which persists it in order in the background.
+    """
+
+    def __init__(self, game: Game):
+        self.game = game
+        self.lobby: List[int] = []
+        self.players: Dict[int, Player] = {}
+        self.votes: Dict[int, Optional[int]] = {}
+        self.night_actions: Dict[int, Dict[str, Any]] = {}
+        self.impostor_votes: Dict[int, Optional[int]] = {}
+        self.detective_votes: Dict[int, Optional[int]] = {}
+        self.tasks: Dict[int, dict] = {}
+        # Bitmask mirror of the roster for the win and explosion checks
+        self.bits = RosterBits([])
+        # Players whose night action (or task) is still outstanding; the night
+        # timer wakes up early once this empties
+        self.pending_actors: Set[int] = set()
+        self.actors_done = asyncio.Event()
+        self.night_open = False
+        # Discussion ready-check and outstanding voters, tracked the same way
+        self.discussion_round = 0
+        self.ready: Set[int] = set()
+        self.discussion_done = asyncio.Event()
+        self.pending_voters: Set[int] = set()
+        self.votes_done = asyncio.Event()
+        self.voting_open = False
+        # Writes held back by batch() until the outermost block exits
+        self._batch: Optional[List[Tuple[str, tuple, Tuple[str, Any]]]] = None
+
+    @property
+    def game_id(self) -> str:
+        return self.game.id
+
+    @property
+    def round_number(self) -> int:
+        return self.game.round_number
+
+    # Reads
+
+    def get_player(self, user_id: int) -> Optional[Player]:
+        return self.players.get(user_id)
+
+    def alive_players(self) -> List[Player]:
+        return [p for p in self.players.values() if p.is_alive]
+
+    def players_by_role(self, role: Role) -> List[Player]:
+        return [p for p in self.players.values() if p.role == role]
+
+    def alive_by_role(self, role: Role) -> List[Player]:
+        return [p for p in self.players.values() if p.role == role and p.is_alive]
+
+    def is_alive(self, user_id: int) -> bool:
+        player = self.players.get(user_id)
+        return player is not None and player.is_alive
+
+    # Night tracking
+
+    def open_night(self, actors: Set[int]):
+        """Start waiting on the players expected to act tonight"""
+        self.night_open = True
+        self.pending_actors = set(actors)
+        self.actors_done = asyncio.Event()
+        if not self.pending_actors:
+            self.actors_done.set()
+
+    def actor_done(self, user_id: int):
+        self.pending_actors.discard(user_id)
+        if not self.pending_actors:
+            self.actors_done.set()
+
+    def close_night(self) -> bool:
+        """Claim the night for resolution; only the first caller gets True"""
+        if not self.night_open:
+            return False
+        self.night_open = False
+        return True
+
+    # Day tracking
+
+    def open_discussion(self) -> bool:
+        """Start this round's discussion; False if it is already under way"""
+        if self.discussion_round == self.round_number:
+            return False
+        self.discussion_round = self.round_number
+        self.ready = set()
+        self.discussion_done = asyncio.Event()
+        return True
+
+    def mark_ready(self, user_id: int, needed: int) -> int:
+        """Count a player as ready to vote; wakes the discussion timer at quorum"""
+        self.ready.add(user_id)
+        if len(self.ready) >= needed:
+            self.discussion_done.set()
+        return len(self.ready)
+
+    def open_voting(self, voters: Set[int]):
+        self.voting_open = True
+        self.pending_voters = set(voters)
+        self.votes_done = asyncio.Event()
+        if not self.pending_voters:
+            self.votes_done.set()
+
+    def voter_done(self, user_id: int):
+        self.pending_voters.discard(user_id)
+        if not self.pending_voters:
+            self.votes_done.set()
+
+    def close_voting(self) -> bool:
+        """Claim the vote for resolution; only the first caller gets True"""
+        if not self.voting_open:
+            return False
+        self.voting_open = False
+        return True
+
+    # Writes
+
+    @contextmanager
+    def batch(self):
+        """Journal every write made inside the block as one group, committed in one transaction"""
+        if self._batch is not None:
+            yield  # Nested blocks join the outer group
+            return
+
+        self._batch = []
+        try:
+            yield
+        finally:
+            entries, self._batch = self._batch, None
+            if entries:
+                journal.append_group(entries)
+
+    def set_roster(self, players: List[Player]):
+        """Adopt the roster written by Database.add_players (already persisted)"""
+        self.players = {player.user_id: player for player in players}
+        self.lobby = []
+        self.bits = RosterBits(players)
+        self.bits.failed_task_rounds = self.game.failed_task_rounds
+
+    def set_phase(self, phase: GamePhase):
+        self.game.phase = phase
+        self._persist_game("update_game_phase", phase.value, self.game_id)
+
+    def start_night_round(self) -> int:
+        """Move to night, bump the round and clear votes, actions and task flags"""
+        self.game.phase = GamePhase.NIGHT
+        self.game.round_number += 1
+        for player in self.players.values():
+            player.voted = False
+            player.completed_task = False
+        self.votes.clear()
+        self.night_actions.clear()
+        self.impostor_votes.clear()
+        self.detective_votes.clear()
+        self._persist_game("set_night_round", self.game_id, GamePhase.NIGHT.value, self.game.round_number)
+        return self.game.round_number
+
+    def set_player_field(self, user_id: int, field: str, value: Any):
+        if field not in PLAYER_FIELDS:
+            raise ValueError(f"Unknown player field: {field}")
+
+        player = self.players.get(user_id)
+        if player is None:
+            return
+        setattr(player, field, value)
+        if field == "is_alive" and not value:
+            self.bits.kill(user_id)
+        elif field == "engineer_used_ability" and value:
+            self.bits.use_engineer_ability(user_id)
+        self._persist_roster(f"update_player_{field}", value, self.game_id, user_id)
+
+    def kill(self, user_id: int):
+        self.set_player_field(user_id, "is_alive", False)
+
+    def record_vote(self, voter_id: int, target_id: Optional[int]):
+        self.votes[voter_id] = target_id
+        self.set_player_field(voter_id, "voted", True)
+        self._persist_roster("record_vote", self.game_id, voter_id, target_id, self.round_number)
+        self.voter_done(voter_id)
+
+    def reset_votes(self):
+        for player in self.players.values():
+            player.voted = False
+        self.votes.clear()
+        self._persist_roster("reset_player_votes", self.game_id)
+
+    def tally_votes(self) -> Dict[Optional[int], int]:
+        """Votes per target this round; None counts skips"""
+        counts: Dict[Optional[int], int] = {}
+        for target_id in self.votes.values():
+            counts[target_id] = counts.get(target_id, 0) + 1
+        return counts
+
+    def increment_failed_rounds(self) -> int:
+        self._set_failed_rounds(self.game.failed_task_rounds + 1)
+        return self.game.failed_task_rounds
+
+    def reset_failed_rounds(self):
+        self._set_failed_rounds(0)
+
+    def use_engineer_fix(self, user_id: int) -> bool:
+        """Spend the engineer's one-time fix and clear failed rounds; False if already spent"""
+        player = self.players.get(user_id)
+        if player is None or player.engineer_used_ability:
+            return False
+        self.set_player_field(user_id, "engineer_used_ability", True)
+        self.reset_failed_rounds()
+        return True
+
+    def _set_failed_rounds(self, failed_task_rounds: int):
+        self.game.failed_task_rounds = failed_task_rounds
+        self.bits.failed_task_rounds = failed_task_rounds
+        self._persist_game("set_failed_task_rounds", failed_task_rounds, self.game_id)
+
+    def _persist_game(self, name: str, *args):
+        self._persist(name, args, ("game", self.game_id))
+
+    def _persist_roster(self, name: str, *args):
+        self._persist(name, args, ("roster", self.game_id))
+
+    def _persist(self, name: str, args: tuple, touched: Tuple[str, Any]):
+        if self._batch is not None:
+            self._batch.append((name, args, touched))
+        else:
+            journal.append(name, args, touched)
+
+class GameSessions:
+    """Live sessions by game id; a game has one from creation until it ends"""
+
+    def __init__(self):
+        self._sessions: Dict[str, GameSession] = {}
+
+    def get(self, game_id: str) -> Optional[GameSession]:
+        return self._sessions.get(game_id)
+
+    def add(self, session: GameSession):
+        self._sessions[session.game_id] = session
+
+    def remove(self, game_id: str) -> Optional[GameSession]:
+        return self._sessions.pop(game_id, None)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._sessions
+
+game_sessions = GameSessions()
@@ -3,6 +3,9 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from src.database.models import Game, Player, GameMode, GamePhase, Role
 from src.database.connection import db
+from src.database.journal import journal
+from src.game.game_session import GameSession, game_sessions
+from src.game.night_resolution import NightOutcome
 from src.game.role_factory import RoleFactory
 from src.game.task_engine import TaskEngine
 
@@ -11,9 +14,10 @@ class GameState:
         self.role_factory = role_factory
         self.task_engine = task_engine
         self.active_games: Dict[int, str] = {}
-        self.lobby_players: Dict[str, List[int]] = {}
-        self.voting_data: Dict[str, Dict[int, Optional[int]]] = {}
-        self.round_numbers: Dict[str, int] = {}
+        # Authoritative state of every live game; the database is written behind it
+        self.sessions = game_sessions
+        # user_id -> game_id for lobby members and living players, so "which game is this user in" never hits the DB
+        self.player_games: Dict[int, str] = {}
 
     async def create_game(self, group_id: int, creator_id: int, mode: GameMode) -> Game:
         game_id = str(uuid.uuid4())
@@ -29,57 +33,94 @@ class GameState:
         
         await db.create_game(game)
         self.active_games[group_id] = game_id
-        self.lobby_players[game_id] = []
-        self.round_numbers[game_id] = 1
+        self.sessions.add(GameSession(game))
         
         return game
 
+    def get_session(self, game_id: str) -> Optional[GameSession]:
+        return self.sessions.get(game_id)
+
     async def join_game(self, game_id: str, user_id: int) -> bool:
-        if game_id not in self.lobby_players:
+        session = self.sessions.get(game_id)
+        if session is None or session.game.phase != GamePhase.LOBBY:
             return False
         
-        if user_id in self.lobby_players[game_id]:
+        if user_id in session.lobby:
             return False
         
-        if len(self.lobby_players[game_id]) >= 20:
+        if len(session.lobby) >= 20:
             return False
         
-        self.lobby_players[game_id].append(user_id)
+        session.lobby.append(user_id)
+        # Someone still alive in a running game keeps that entry; the lobby is indexed when it starts
+        current = self.sessions.get(self.player_games.get(user_id))
+        if current is None or current.game.phase == GamePhase.LOBBY:
+            self.player_games[user_id] = game_id
         return True
 
+    def leave_lobby(self, game_id: str, user_id: int):
+        session = self.sessions.get(game_id)
+        if session and user_id in session.lobby:
+            session.lobby.remove(user_id)
+            self._unindex_player(user_id, game_id)
+
     async def start_game(self, game_id: str) -> bool:
-        if game_id not in self.lobby_players:
+        session = self.sessions.get(game_id)
+        if session is None or session.game.phase != GamePhase.LOBBY:
             return False
         
-        players = self.lobby_players[game_id]
+        players = session.lobby
         if len(players) < 4:
             return False
         
         role_assignments = self.role_factory.distribute_roles(players)
         
-        for user_id, role in role_assignments.items():
-            player = Player(game_id=game_id, user_id=user_id, role=role)
-            await db.add_player(player)
-        
-        await db.update_game_phase(game_id, GamePhase.NIGHT)
+        roster = [
+            Player(game_id=game_id, user_id=user_id, role=role)
+            for user_id, role in role_assignments.items()
+        ]
+        # The roster insert is awaited: every journaled write after it refers to these rows
+        await db.add_players(game_id, roster, GamePhase.NIGHT)
+        session.set_roster(roster)
+        session.game.phase = GamePhase.NIGHT
+        for user_id in role_assignments:
+            self.player_games[user_id] = game_id
         
-        del self.lobby_players[game_id]
         return True
 
     async def get_game_by_group(self, group_id: int) -> Optional[Game]:
+        session = self.sessions.get(self.active_games.get(group_id))
+        if session is not None:
+            return session.game
         return await db.get_game_by_group(group_id)
 
+    async def sync_game(self, game_id: str):
+        """Wait for the game's journaled writes; rewrite it from memory if PostgreSQL refused any"""
+        if await journal.drain():
+            await self._write_snapshot_if_dirty(game_id)
+
+    async def _write_snapshot_if_dirty(self, game_id: str):
+        session = self.sessions.get(game_id)
+        if session is not None and journal.take_dirty(game_id):
+            await db.write_game_snapshot(session.game, list(session.players.values()), session.votes)
+
     async def end_game(self, game_id: str):
-        await db.end_game(game_id)
-        
-        if game_id in self.lobby_players:
-            del self.lobby_players[game_id]
-        if game_id in self.voting_data:
-            del self.voting_data[game_id]
-        if game_id in self.round_numbers:
-            del self.round_numbers[game_id]
-        
-        self.task_engine.clear_game_tasks(game_id)
+        # Journaled writes for the game must land before it is marked ended
+        if await journal.drain():
+            # The repair snapshot and the ended flag commit together or not at all
+            async with db.session():
+                await self._write_snapshot_if_dirty(game_id)
+                await db.end_game(game_id)
+        else:
+            # The database is unreachable; queue the ended flag behind the game's other writes
+            journal.append("end_game", (datetime.now(), game_id), ("game", game_id))
+            db.game_cache.evict(game_id)
+            db.roster_cache.evict(game_id)
+        
+        self.sessions.remove(game_id)
+
+        for user_id in [u for u, g_id in self.player_games.items() if g_id == game_id]:
+            del self.player_games[user_id]
         
         for group_id, g_id in list(self.active_games.items()):
             if g_id == game_id:
@@ -87,46 +128,27 @@ class GameState:
                 break
 
     async def transition_phase(self, game_id: str, new_phase: GamePhase):
-        await db.update_game_phase(game_id, new_phase)
-        
+        session = self.sessions.get(game_id)
+        if session is None:
+            return
         if new_phase == GamePhase.NIGHT:
-            await db.reset_votes(game_id)
-            await db.reset_tasks(game_id)
-            self.round_numbers[game_id] = self.round_numbers.get(game_id, 0) + 1
-            
-            # Persist round number to database
-            game = await db.get_game_by_id(game_id)
-            if game:
-                settings = game.settings or {}
-                settings['round_number'] = self.round_numbers[game_id]
-                await db.update_game_settings(game_id, settings)
+            # Phase change, round bump and vote/task reset are one journaled write
+            session.start_night_round()
+        else:
+            session.set_phase(new_phase)
 
     def get_lobby_players(self, game_id: str) -> List[int]:
-        return self.lobby_players.get(game_id, [])
+        session = self.sessions.get(game_id)
+        return session.lobby if session else []
 
     async def vote_player(self, game_id: str, voter_id: int, target_id: Optional[int]):
-        if game_id not in self.voting_data:
-            self.voting_data[game_id] = {}
-        
-        self.voting_data[game_id][voter_id] = target_id
-        await db.mark_voted(game_id, voter_id)
-        
-        # Record vote in database for persistence
-        round_number = self.round_numbers.get(game_id, 1)
-        await db.record_vote(game_id, voter_id, target_id, round_number)
+        session = self.sessions.get(game_id)
+        if session is not None:
+            session.record_vote(voter_id, target_id)
 
     async def resolve_votes(self, game_id: str) -> Dict[str, Any]:
-        # Use database for vote counting to ensure persistence
-        round_number = self.round_numbers.get(game_id, 1)
-        vote_counts = await db.get_vote_results(game_id, round_number)
-        
-        if not vote_counts:
-            return {"ejected": None, "votes": vote_counts}
-        
-        # Convert -1 (skip votes) back to None for processing
-        processed_votes = {}
-        for target, count in vote_counts.items():
-            processed_votes[target if target != -1 else None] = count
+        session = self.sessions.get(game_id)
+        processed_votes = session.tally_votes() if session else {}
         
         if not processed_votes:
             return {"ejected": None, "votes": processed_votes}
@@ -138,36 +160,50 @@ class GameState:
         ejected = None if len(winners) > 1 or (len(winners) == 1 and winners[0] is None) else winners[0]
         
         if ejected:
-            await db.kill_player(game_id, ejected)
-        
-        # Clear in-memory voting data
-        self.voting_data[game_id] = {}
+            await self.kill_player(game_id, ejected)
         
         return {"ejected": ejected, "votes": processed_votes}
 
     def get_round_number(self, game_id: str) -> int:
-        return self.round_numbers.get(game_id, 1)
+        session = self.sessions.get(game_id)
+        return session.round_number if session else 1
+
+    async def kill_player(self, game_id: str, user_id: int):
+        session = self.sessions.get(game_id)
+        if session is not None:
+            session.kill(user_id)
+        self._unindex_player(user_id, game_id)
+
+    def apply_night_outcome(self, session: GameSession, outcome: NightOutcome):
+        """Apply a resolved night to the session; its writes are journaled as one transaction"""
+        with session.batch():
+            for user_id, field, value in outcome.flags:
+                session.set_player_field(user_id, field, value)
+            for death in outcome.deaths:
+                session.kill(death["user_id"])
+                self._unindex_player(death["user_id"], session.game_id)
+            if not outcome.task_success:
+                session.increment_failed_rounds()
+
+    def get_game_id_by_user(self, user_id: int) -> Optional[str]:
+        """Game a user is in the lobby of or still alive in, without touching the database"""
+        return self.player_games.get(user_id)
 
     async def get_game_by_user(self, user_id: int) -> Optional[Game]:
         """Find the active game that a user is participating in"""
-        # Check all active games
-        for group_id, game_id in self.active_games.items():
-            # Check if user is in lobby
-            if game_id in self.lobby_players and user_id in self.lobby_players[game_id]:
-                return await self.get_game_by_group(group_id)
-            
-            # Check if user is a player in the game
-            player = await db.get_player(game_id, user_id)
-            if player:
-                return await db.get_game_by_id(game_id)
-        
-        return None
+        game_id = self.player_games.get(user_id)
+        if game_id is None:
+            return None
+        session = self.sessions.get(game_id)
+        return session.game if session else await db.get_game_by_id(game_id)
+
+    def _unindex_player(self, user_id: int, game_id: str):
+        # A user can sit in several lobbies; only drop the entry if it points at this game
+        if self.player_games.get(user_id) == game_id:
+            del self.player_games[user_id]
 
     async def reset_failed_rounds(self, game_id: str):
         """Reset failed task rounds for a game"""
-        # Update the game settings to reset failed rounds
-        game = await db.get_game_by_id(game_id)
-        if game:
-            settings = game.settings or {}
-            settings['failed_task_rounds'] = 0
-            await db.update_game_settings(game_id, settings)
+        session = self.sessions.get(game_id)
+        if session is not None:
+            session.reset_failed_rounds()
\ No newline at end of file
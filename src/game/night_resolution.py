@@ -0,0 +1,186 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from src.database.models import Role
+from src.game.game_session import GameSession
+
+class NightOutcome:
+    """Everything one night changes, worked out before any of it is applied"""
+
+    def __init__(self, round_number: int):
+        self.round_number = round_number
+        self.deaths: List[Dict[str, Any]] = []
+        self.investigations: List[Dict[str, Any]] = []
+        self.task_success = False
+        # (user_id, player field, value) - persisted with the deaths in one transaction
+        self.flags: List[Tuple[int, str, Any]] = []
+        # (user_id, xp event) for XPSystem.award_xp / deduct_xp
+        self.rewards: List[Tuple[int, str]] = []
+        self.penalties: List[Tuple[int, str]] = []
+        # Positional arguments for GameLogger.log_sheriff_action / log_detective_investigation
+        self.sheriff_logs: List[tuple] = []
+        self.detective_logs: List[tuple] = []
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "deaths": self.deaths,
+            "investigations": self.investigations,
+            "task_success": self.task_success,
+            "round_number": self.round_number
+        }
+
+class NightResolver:
+    """Resolves a night from one session snapshot, without awaiting anything.
+
+    Order matters: AFK checks see the night as it started, sheriff shots land
+    before impostor kills, and detectives only look at players still alive.
+    """
+
+    @staticmethod
+    def resolve(session: GameSession) -> NightOutcome:
+        outcome = NightOutcome(session.round_number)
+        alive = {p.user_id for p in session.alive_players()}
+
+        NightResolver._afk_penalties(session, alive, outcome)
+        NightResolver._sheriff_shots(session, alive, outcome)
+        NightResolver._impostor_kill(session, alive, outcome)
+        NightResolver._investigations(session, alive, outcome)
+
+        # Every assigned task has to be done
+        outcome.task_success = all(
+            session.players[user_id].completed_task
+            for user_id in session.tasks if user_id in session.players
+        )
+        return outcome
+
+    @staticmethod
+    def can_investigate(session: GameSession, alive_detectives: int) -> bool:
+        """A lone detective investigates every second round, a pair every round"""
+        return alive_detectives > 1 or session.round_number % 2 == 0
+
+    @staticmethod
+    def _alive_with_role(session: GameSession, alive: Set[int], role: Role) -> List[int]:
+        return [p.user_id for p in session.players.values() if p.role == role and p.user_id in alive]
+
+    @staticmethod
+    def _afk_penalties(session: GameSession, alive: Set[int], outcome: NightOutcome):
+        detective_required = NightResolver.can_investigate(
+            session, len(NightResolver._alive_with_role(session, alive, Role.DETECTIVE))
+        )
+
+        for user_id in alive:
+            player = session.players[user_id]
+            if player.role == Role.CREWMATE:
+                required = user_id in session.tasks
+                acted = player.completed_task
+            elif player.role == Role.IMPOSTOR:
+                required = True
+                acted = bool(session.night_actions.get(user_id)) or user_id in session.impostor_votes
+            elif player.role == Role.DETECTIVE:
+                required = detective_required
+                acted = bool(session.night_actions.get(user_id)) or user_id in session.detective_votes
+            elif player.role == Role.SHERIFF:
+                required = True
+                acted = bool(session.night_actions.get(user_id))
+            else:
+                required = False
+                acted = False
+
+            if required and not acted:
+                outcome.penalties.append((user_id, "afk"))
+
+    @staticmethod
+    def _kill(session: GameSession, alive: Set[int], outcome: NightOutcome, user_id: int, cause: str,
+              sheriff_success: Optional[bool] = None):
+        alive.discard(user_id)
+        death = {"user_id": user_id, "cause": cause, "role": session.players[user_id].role.value}
+        if sheriff_success is not None:
+            death["sheriff_success"] = sheriff_success
+        outcome.deaths.append(death)
+
+    @staticmethod
+    def _sheriff_shots(session: GameSession, alive: Set[int], outcome: NightOutcome):
+        for sheriff_id in NightResolver._alive_with_role(session, alive, Role.SHERIFF):
+            if sheriff_id not in alive:
+                continue  # Shot by an earlier sheriff tonight
+
+            action = session.night_actions.get(sheriff_id)
+            if not action or action.get("action") != "shoot" or not action.get("target"):
+                continue
+            if session.players[sheriff_id].sheriff_used_shot:
+                continue
+
+            target_id = action["target"]
+            target = session.get_player(target_id)
+            if not target or target_id not in alive:
+                continue
+
+            if target.role == Role.IMPOSTOR:
+                # Successful shot - impostor dies, sheriff keeps the shot for another night
+                NightResolver._kill(session, alive, outcome, target_id, "sheriff_kill", True)
+                outcome.rewards.append((sheriff_id, "sheriff_kills_impostor"))
+                outcome.sheriff_logs.append((session.game_id, sheriff_id, target_id, target.role.value, True))
+            else:
+                # Friendly fire - both die
+                outcome.flags.append((sheriff_id, "sheriff_used_shot", True))
+                NightResolver._kill(session, alive, outcome, target_id, "sheriff_friendly_fire", False)
+                NightResolver._kill(session, alive, outcome, sheriff_id, "sheriff_suicide", False)
+                outcome.penalties.append((sheriff_id, "sheriff_friendly_fire"))
+                outcome.sheriff_logs.append((session.game_id, sheriff_id, target_id, target.role.value, False))
+
+    @staticmethod
+    def _impostor_kill(session: GameSession, alive: Set[int], outcome: NightOutcome):
+        impostors = NightResolver._alive_with_role(session, alive, Role.IMPOSTOR)
+        if not impostors:
+            return
+
+        if len(impostors) == 1:
+            # Solo impostor - direct kill
+            killers = impostors
+            action = session.night_actions.get(impostors[0])
+            target_id = action.get("target") if action and action.get("action") == "kill" else None
+        else:
+            # Multiple impostors - the single most voted target, no kill on a tie
+            killers = list(session.impostor_votes)
+            vote_counts: Dict[int, int] = {}
+            for target in session.impostor_votes.values():
+                if target is not None:
+                    vote_counts[target] = vote_counts.get(target, 0) + 1
+            winners = [t for t, c in vote_counts.items() if c == max(vote_counts.values())] if vote_counts else []
+            target_id = winners[0] if len(winners) == 1 else None
+
+        # The target may already have fallen to a sheriff
+        if target_id and target_id in alive:
+            NightResolver._kill(session, alive, outcome, target_id, "impostor_kill")
+            outcome.rewards.extend((killer_id, "impostor_kill") for killer_id in killers)
+
+    @staticmethod
+    def _investigations(session: GameSession, alive: Set[int], outcome: NightOutcome):
+        detectives = NightResolver._alive_with_role(session, alive, Role.DETECTIVE)
+        if not detectives or not NightResolver.can_investigate(session, len(detectives)):
+            return
+
+        if len(detectives) == 1:
+            action = session.night_actions.get(detectives[0])
+            investigators = detectives
+            target_id = action.get("target") if action and action.get("action") == "investigate" else None
+        else:
+            # Multiple detectives - both must pick the same target
+            votes = session.detective_votes
+            investigators = list(votes)
+            targets = set(votes.values())
+            target_id = targets.pop() if len(votes) >= 2 and len(targets) == 1 else None
+
+        if not target_id or target_id not in alive:
+            return
+
+        result = "Impostor" if session.players[target_id].role == Role.IMPOSTOR else "Not Impostor"
+        for detective_id in investigators:
+            outcome.investigations.append({
+                "detective_id": detective_id,
+                "target_id": target_id,
+                "result": result
+            })
+            outcome.rewards.append((detective_id, "detective_investigation"))
+            outcome.flags.append((detective_id, "detective_last_investigation", session.round_number))
+        outcome.detective_logs.append(
+            (session.game_id, investigators[0] if len(investigators) == 1 else 0, target_id, result)
+        )
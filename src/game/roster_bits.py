@@ -0,0 +1,49 @@
+from typing import Dict, List, Optional
+from src.database.models import Player, Role
+
+class RosterBits:
+    """Compact rules state of one game: alive and role membership as bitmasks over seats.
+
+    Games hold at most 20 players, so each mask is a small int and the win and
+    explosion checks come down to a few ANDs and popcounts. GameSession keeps it
+    current on every death, ability use and failed round.
+    """
+
+    def __init__(self, players: List[Player]):
+        self.seats: Dict[int, int] = {}
+        self.alive = 0
+        self.roles: Dict[Role, int] = {role: 0 for role in Role}
+        self.engineer_used = 0
+        self.failed_task_rounds = 0
+
+        for seat, player in enumerate(players):
+            bit = 1 << seat
+            self.seats[player.user_id] = bit
+            self.roles[player.role] |= bit
+            if player.is_alive:
+                self.alive |= bit
+            if player.engineer_used_ability:
+                self.engineer_used |= bit
+
+    def kill(self, user_id: int):
+        self.alive &= ~self.seats.get(user_id, 0)
+
+    def use_engineer_ability(self, user_id: int):
+        self.engineer_used |= self.seats.get(user_id, 0)
+
+    def alive_count(self, role: Role) -> int:
+        return (self.alive & self.roles[role]).bit_count()
+
+    def win_condition(self) -> Optional[str]:
+        """'crewmates', 'impostors' or None while the game goes on"""
+        impostors = self.alive_count(Role.IMPOSTOR)
+        if impostors == 0:
+            return "crewmates"
+        if impostors >= self.alive.bit_count() - impostors:
+            return "impostors"
+        return None
+
+    def ship_explodes(self) -> bool:
+        """Two failed rounds blow the ship up unless a living engineer still has the fix"""
+        fixable = self.alive & self.roles[Role.ENGINEER] & ~self.engineer_used
+        return self.failed_task_rounds >= 2 and not fixable
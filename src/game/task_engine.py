@@ -1,13 +1,12 @@
 import random
-from typing import List, Dict
+from typing import List
 from src.game.task_pool import TASK_POOL
 from src.utils.constants import TASK_DISTRIBUTION
-from src.database.connection import db
+from src.game.game_session import game_sessions
 from src.database.models import Role
 
 class TaskEngine:
-    def __init__(self):
-        self.active_tasks: Dict[str, Dict[int, dict]] = {}
+    """Hands out night tasks; assignments are kept on each game's session"""
 
     def get_task_count_for_players(self, player_count: int) -> int:
         for (min_players, max_players), count in TASK_DISTRIBUTION.items():
@@ -16,51 +15,52 @@ class TaskEngine:
         return 1
 
     async def assign_tasks(self, game_id: str) -> List[int]:
-        players = await db.get_players(game_id)
-        crewmates = [p for p in players if p.role == Role.CREWMATE and p.is_alive]
+        session = game_sessions.get(game_id)
+        if session is None:
+            return []
+        crewmates = session.alive_by_role(Role.CREWMATE)
         
-        task_count = self.get_task_count_for_players(len(players))
+        task_count = self.get_task_count_for_players(len(session.players))
         assigned_players = random.sample(crewmates, min(task_count, len(crewmates)))
         
-        self.active_tasks[game_id] = {}
-        
-        for player in assigned_players:
-            task = random.choice(TASK_POOL)
-            self.active_tasks[game_id][player.user_id] = task
+        session.tasks = {player.user_id: random.choice(TASK_POOL) for player in assigned_players}
             
         return [p.user_id for p in assigned_players]
 
     def get_player_task(self, game_id: str, user_id: int) -> dict:
-        return self.active_tasks.get(game_id, {}).get(user_id)
+        session = game_sessions.get(game_id)
+        return session.tasks.get(user_id) if session else None
 
     async def complete_task(self, game_id: str, user_id: int, task_id: str = None) -> bool:
-        if game_id in self.active_tasks and user_id in self.active_tasks[game_id]:
+        session = game_sessions.get(game_id)
+        if session and user_id in session.tasks:
             # If task_id is provided, validate it matches the assigned task
             if task_id:
-                assigned_task = self.active_tasks[game_id][user_id]
+                assigned_task = session.tasks[user_id]
                 if assigned_task.get('task_id') != task_id:
                     return False
                 
                 # For brain-based tasks, we assume the correct button was pressed
                 # In a more advanced implementation, we could validate the actual answer
             
-            await db.update_player_field(game_id, user_id, "completed_task", True)
+            session.set_player_field(user_id, "completed_task", True)
+            session.actor_done(user_id)
             return True
         return False
 
-    async def check_task_completion(self, game_id: str) -> bool:
-        if game_id not in self.active_tasks:
+    def check_task_completion(self, game_id: str) -> bool:
+        session = game_sessions.get(game_id)
+        if session is None:
             return True
-            
-        assigned_players = list(self.active_tasks[game_id].keys())
         
-        for user_id in assigned_players:
-            player = await db.get_player(game_id, user_id)
+        for user_id in session.tasks:
+            player = session.get_player(user_id)
             if not player or not player.completed_task:
                 return False
         
         return True
 
     def clear_game_tasks(self, game_id: str):
-        if game_id in self.active_tasks:
-            del self.active_tasks[game_id]
\ No newline at end of file
+        session = game_sessions.get(game_id)
+        if session is not None:
+            session.tasks = {}
\ No newline at end of file
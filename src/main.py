@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import sys
+from telegram import Update
 from src.bot.bot_instance import bot_instance
 from src.bot.dispatcher import setup_handlers
 
@@ -20,7 +21,8 @@ async def main():
         
         await bot_instance.application.initialize()
         await bot_instance.application.start()
-        await bot_instance.application.updater.start_polling()
+        # chat_member updates are only delivered when explicitly requested
+        await bot_instance.application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
         
         logger.info("🚀 Bot started successfully - Let the games begin!")
         
@@ -3,6 +3,7 @@ from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 from src.roles.base_role import BaseRole
 from src.database.connection import db
 from src.database.models import Role
+from src.ui.keyboards import Keyboards
 
 class Detective(BaseRole):
     def __init__(self, user_id: int, game_id: str, round_number: int):
@@ -26,16 +27,9 @@ class Detective(BaseRole):
                 InlineKeyboardButton("Investigation on cooldown", callback_data="no_action")
             ]])
 
-        players = await db.get_players(self.game_id)
-        alive_players = [p for p in players if p.is_alive and p.user_id != self.user_id]
-        
-        buttons = []
-        for player in alive_players:
-            buttons.append([InlineKeyboardButton(
-                f"Investigate Player {player.user_id}", 
-                callback_data=f"detective_investigate_{self.game_id}_{player.user_id}"
-            )])
+        rows = await Keyboards.get_target_buttons(self.game_id, "detective", "Investigate", "detective_investigate")
         
+        buttons = [[button] for target_id, button in rows if target_id != self.user_id]
         buttons.append([InlineKeyboardButton("Skip", callback_data=f"detective_skip_{self.game_id}")])
         
         return InlineKeyboardMarkup(buttons)
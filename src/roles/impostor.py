@@ -3,6 +3,7 @@ from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 from src.roles.base_role import BaseRole
 from src.database.connection import db
 from src.database.models import Role
+from src.ui.keyboards import Keyboards
 
 class Impostor(BaseRole):
     def __init__(self, user_id: int, game_id: str):
@@ -10,16 +11,12 @@ class Impostor(BaseRole):
         self.votes: Dict[str, Dict[int, int]] = {}
 
     async def get_night_action_keyboard(self) -> InlineKeyboardMarkup:
-        players = await db.get_players(self.game_id)
-        alive_non_impostors = [p for p in players if p.is_alive and p.role != Role.IMPOSTOR]
-        
-        buttons = []
-        for player in alive_non_impostors:
-            buttons.append([InlineKeyboardButton(
-                f"Kill Player {player.user_id}", 
-                callback_data=f"impostor_kill_{self.game_id}_{player.user_id}"
-            )])
+        rows = await Keyboards.get_target_buttons(
+            self.game_id, "impostor_team", "Kill", "impostor_kill",
+            include=lambda player: player.role != Role.IMPOSTOR
+        )
         
+        buttons = [[button] for _, button in rows]
         buttons.append([InlineKeyboardButton("Skip", callback_data=f"impostor_skip_{self.game_id}")])
         
         return InlineKeyboardMarkup(buttons)
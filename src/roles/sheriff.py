@@ -3,6 +3,7 @@ from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 from src.roles.base_role import BaseRole
 from src.database.connection import db
 from src.database.models import Role
+from src.ui.keyboards import Keyboards
 
 class Sheriff(BaseRole):
     def __init__(self, user_id: int, game_id: str):
@@ -13,16 +14,9 @@ class Sheriff(BaseRole):
         sheriff_used_shot = await db.get_player_field(self.game_id, self.user_id, "sheriff_used_shot")
         
         if not sheriff_used_shot:
-            players = await db.get_players(self.game_id)
-            alive_players = [p for p in players if p.is_alive and p.user_id != self.user_id]
-            
-            buttons = []
-            for player in alive_players:
-                buttons.append([InlineKeyboardButton(
-                    f"Shoot Player {player.user_id}", 
-                    callback_data=f"sheriff_shoot_{self.game_id}_{player.user_id}"
-                )])
+            rows = await Keyboards.get_target_buttons(self.game_id, "sheriff", "Shoot", "sheriff_shoot")
             
+            buttons = [[button] for target_id, button in rows if target_id != self.user_id]
             buttons.append([InlineKeyboardButton("Save shot", callback_data=f"sheriff_skip_{self.game_id}")])
             
             return InlineKeyboardMarkup(buttons)
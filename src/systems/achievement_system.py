@@ -16,11 +16,7 @@ class AchievementSystem:
                 await self._award_achievement(user_id, achievement_id, achievement)
 
     async def _award_achievement(self, user_id: int, achievement_id: str, achievement: dict):
-        async with db.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE users SET achievements = achievements || $1 WHERE id = $2",
-                {achievement_id: True}, user_id
-            )
+        await db.merge_user_achievements(user_id, {achievement_id: True})
 
         try:
             await self.bot.send_message(
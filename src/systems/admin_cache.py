@@ -0,0 +1,55 @@
+import asyncio
+import time
+from typing import Dict, Set, Tuple
+from telegram import Bot, ChatMemberUpdated
+from telegram.error import TelegramError
+from src.utils.config import ADMIN_CACHE_TTL
+
+class AdminCache:
+    """Per-group administrator ids from get_chat_administrators, kept for ADMIN_CACHE_TTL seconds.
+
+    ChatMemberUpdated updates patch cached groups in between, so promotions and
+    demotions take effect without waiting for the TTL.
+    """
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self._admins: Dict[int, Tuple[float, Set[int]]] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    async def is_admin(self, chat_id: int, user_id: int) -> bool:
+        return user_id in await self.get_admins(chat_id)
+
+    async def get_admins(self, chat_id: int) -> Set[int]:
+        entry = self._admins.get(chat_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        # Concurrent checks in the same group share one API call
+        async with self._locks.setdefault(chat_id, asyncio.Lock()):
+            entry = self._admins.get(chat_id)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+
+            try:
+                members = await self.bot.get_chat_administrators(chat_id)
+            except TelegramError:
+                return set()
+
+            admins = {member.user.id for member in members}
+            self._admins[chat_id] = (time.monotonic() + ADMIN_CACHE_TTL, admins)
+            return admins
+
+    def apply_update(self, update: ChatMemberUpdated):
+        entry = self._admins.get(update.chat.id)
+        if entry is None:
+            return  # Not cached - the next lookup fetches a fresh list anyway
+
+        user_id = update.new_chat_member.user.id
+        if update.new_chat_member.status in ['administrator', 'creator']:
+            entry[1].add(user_id)
+        else:
+            entry[1].discard(user_id)
+
+    def invalidate(self, chat_id: int):
+        self._admins.pop(chat_id, None)
@@ -0,0 +1,57 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from src.database.connection import db
+from src.systems.logger import BotLogger
+from src.utils.config import ARCHIVE_AFTER_HOURS, ARCHIVE_BATCH_SIZE, ARCHIVE_INTERVAL_SECONDS, VOTE_RETENTION_DAYS
+
+class GameArchiver:
+    """Keeps the hot tables sized to live games by archiving ended ones in bounded chunks"""
+
+    def __init__(self, bot_logger: BotLogger):
+        self.bot_logger = bot_logger
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                await self.bot_logger.log_error(f"Archive run failed: {e}")
+            await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
+
+    async def run_once(self):
+        archived_games = 0
+        ended_before = datetime.now() - timedelta(hours=ARCHIVE_AFTER_HOURS)
+        while True:
+            moved = await db.archive_ended_games(ended_before, ARCHIVE_BATCH_SIZE)
+            archived_games += moved
+            if moved < ARCHIVE_BATCH_SIZE:
+                break
+            await asyncio.sleep(0)  # Let game traffic through between chunks
+
+        purged_votes = 0
+        if VOTE_RETENTION_DAYS > 0:
+            cast_before = datetime.now() - timedelta(days=VOTE_RETENTION_DAYS)
+            while True:
+                purged = await db.purge_archived_votes(cast_before, ARCHIVE_BATCH_SIZE)
+                purged_votes += purged
+                if purged < ARCHIVE_BATCH_SIZE:
+                    break
+                await asyncio.sleep(0)
+
+        if archived_games or purged_votes:
+            await self.bot_logger.log_archive_run(archived_games, purged_votes)
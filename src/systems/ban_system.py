@@ -1,33 +1,70 @@
+import asyncio
+import heapq
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
 from src.database.connection import db
 from src.systems.logger import BotLogger
+from src.utils.config import BAN_SWEEP_INTERVAL
 
 class BanSystem:
+    """In-memory ban registry: a set of banned users plus a min-heap of expiry times.
+
+    Loaded from the bans table at startup, updated on every ban/unban and on
+    invalidations from other processes, so ban checks never touch the database.
+    """
+
     def __init__(self, bot_logger: BotLogger):
         self.bot_logger = bot_logger
+        self._banned: Set[int] = set()
+        self._expiries: Dict[int, datetime] = {}
+        # May hold stale entries for re-banned or unbanned users - the sweeper skips those
+        self._expiry_heap: List[Tuple[datetime, int]] = []
+        self._sweeper: Optional[asyncio.Task] = None
+        db.add_invalidation_listener("ban", self._on_ban_invalidated)
+
+    async def load(self):
+        bans = await db.get_bans()
+        self._banned = {ban.user_id for ban in bans}
+        self._expiries = {ban.user_id: ban.expires_at for ban in bans if ban.expires_at}
+        self._expiry_heap = [(expires_at, user_id) for user_id, expires_at in self._expiries.items()]
+        heapq.heapify(self._expiry_heap)
+
+    def start(self):
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def stop(self):
+        if self._sweeper and not self._sweeper.done():
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+        self._sweeper = None
 
     async def ban_user(self, user_id: int, duration: str, reason: str):
-        await db.ban_user(user_id, duration, reason)
+        expires_at = self.parse_duration(duration)
+        await db.ban_user(user_id, duration, reason, expires_at)
+        self._add(user_id, expires_at)
         await self.bot_logger.log_ban(user_id, duration, reason)
 
     async def unban_user(self, user_id: int):
         await db.unban_user(user_id)
+        self._remove(user_id)
         await self.bot_logger.log_unban(user_id)
 
-    async def is_user_banned(self, user_id: int) -> bool:
-        user = await db.get_user(user_id)
-        if not user or not user.is_banned:
-            return False
-
-        if user.ban_expiry and user.ban_expiry <= datetime.now():
-            await self.unban_user(user_id)
+    def is_user_banned(self, user_id: int) -> bool:
+        if user_id not in self._banned:
             return False
 
-        return True
+        # Exact even between sweeps - the sweeper only does the database cleanup
+        expires_at = self._expiries.get(user_id)
+        return expires_at is None or expires_at > datetime.now()
 
-    def parse_duration(self, duration: str) -> datetime:
+    def parse_duration(self, duration: str) -> Optional[datetime]:
+        """Expiry time for a ban duration such as 12h, 7d or 1m; None for a permanent ban"""
         if duration == "perma":
-            return datetime.max
+            return None
 
         unit = duration[-1].lower()
         amount = int(duration[:-1])
@@ -39,4 +76,60 @@ class BanSystem:
         elif unit == 'm':
             return datetime.now() + timedelta(days=amount * 30)
 
-        raise ValueError("Invalid duration format")
\ No newline at end of file
+        raise ValueError("Invalid duration format")
+
+    def _add(self, user_id: int, expires_at: Optional[datetime]):
+        self._banned.add(user_id)
+        if expires_at is None:
+            self._expiries.pop(user_id, None)
+        else:
+            self._expiries[user_id] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, user_id))
+
+    def _remove(self, user_id: int):
+        self._banned.discard(user_id)
+        self._expiries.pop(user_id, None)
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(BAN_SWEEP_INTERVAL)
+            now = datetime.now()
+            failed = []
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expires_at, user_id = heapq.heappop(self._expiry_heap)
+                if self._expiries.get(user_id) != expires_at:
+                    continue
+                try:
+                    await self._lift_expired(user_id, now)
+                except Exception as e:
+                    failed.append((expires_at, user_id))
+                    await self.bot_logger.log_error(f"Failed to lift expired ban for {user_id}: {e}")
+            # Retried on the next sweep instead of being lost until a restart
+            for entry in failed:
+                heapq.heappush(self._expiry_heap, entry)
+
+    async def _lift_expired(self, user_id: int, now: datetime):
+        # Every process sweeps the same bans; only the one whose DELETE matched logs the unban
+        if await db.lift_expired_ban(user_id, now):
+            self._remove(user_id)
+            await self.bot_logger.log_unban(user_id)
+        else:
+            await self._reload(user_id)
+
+    def _on_ban_invalidated(self, user_id: Optional[int]):
+        asyncio.create_task(self._reload(user_id))
+
+    async def _reload(self, user_id: Optional[int]):
+        """Re-read bans another process changed (all of them when user_id is None)"""
+        try:
+            if user_id is None:
+                await self.load()
+                return
+
+            ban = await db.get_ban(user_id)
+            if ban:
+                self._add(user_id, ban.expires_at)
+            else:
+                self._remove(user_id)
+        except Exception as e:
+            await self.bot_logger.log_error(f"Failed to reload bans: {e}")
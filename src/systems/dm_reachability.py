@@ -0,0 +1,47 @@
+import time
+from typing import Dict, Tuple
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden
+from src.utils.constants import DM_RETRY_BASE, DM_RETRY_MAX
+
+class DMReachability:
+    """Remembers users the bot cannot DM (blocked it or never started it).
+
+    Sends to them are skipped until their back-off expires; each failed re-probe
+    doubles the wait up to DM_RETRY_MAX, and any successful send clears it.
+    """
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self._unreachable: Dict[int, Tuple[float, int]] = {}  # user_id -> (retry_at, failures)
+
+    def is_reachable(self, user_id: int) -> bool:
+        entry = self._unreachable.get(user_id)
+        return entry is None or entry[0] <= time.monotonic()
+
+    async def send(self, user_id: int, text: str, **kwargs) -> bool:
+        """DM a user; False if they are known to be unreachable or turn out to be"""
+        if not self.is_reachable(user_id):
+            return False
+
+        try:
+            await self.bot.send_message(user_id, text, **kwargs)
+        except Forbidden:
+            self.mark_unreachable(user_id)
+            return False
+        except BadRequest as e:
+            if "chat not found" not in str(e).lower():
+                raise
+            self.mark_unreachable(user_id)
+            return False
+
+        self.mark_reachable(user_id)
+        return True
+
+    def mark_unreachable(self, user_id: int):
+        failures = self._unreachable.get(user_id, (0.0, 0))[1] + 1
+        delay = min(DM_RETRY_BASE * 2 ** (failures - 1), DM_RETRY_MAX)
+        self._unreachable[user_id] = (time.monotonic() + delay, failures)
+
+    def mark_reachable(self, user_id: int):
+        self._unreachable.pop(user_id, None)
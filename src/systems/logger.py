@@ -157,6 +157,10 @@ class BotLogger:
                 f"🔓 User unbanned: {user_id}"
             )
 
+    async def log_archive_run(self, archived_games: int, purged_votes: int):
+        # Routine housekeeping - structured log only, no channel spam
+        logger.info("Swept old games into the airlock 🧹", archived_games=archived_games, purged_votes=purged_votes)
+
     async def log_error(self, error: str, context: dict = None):
         logger.error("Something went horribly wrong 💩", error=error, context=context or {})
         
@@ -85,15 +85,4 @@ class XPSystem:
 
     async def _update_user_achievement(self, user_id: int, key: str, value: Any):
         """Update a specific achievement counter for a user"""
-        user = await db.get_user(user_id)
-        if not user:
-            return
-            
-        achievements = user.achievements or {}
-        achievements[key] = value
-        
-        async with db.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE users SET achievements = $1 WHERE id = $2",
-                achievements, user_id
-            )
\ No newline at end of file
+        await db.merge_user_achievements(user_id, {key: value})
@@ -1,9 +1,36 @@
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from src.database.connection import db
-from src.database.models import Role
+from src.database.models import Player, Role
+from src.game.game_session import game_sessions
+from src.ui.messages import Messages
 from src.utils.config import BOT_USERNAME
 
+class KeyboardCache:
+    """Target button rows keyed by (game_id, round, phase, viewer class).
+
+    Only the current round and phase of a game are kept: storing rows for a new
+    one drops whatever the game had before.
+    """
+
+    def __init__(self):
+        self._rows: Dict[Tuple[str, int, str, str], List[Tuple[int, InlineKeyboardButton]]] = {}
+
+    def get(self, key: Tuple[str, int, str, str]) -> Optional[List[Tuple[int, InlineKeyboardButton]]]:
+        return self._rows.get(key)
+
+    def put(self, key: Tuple[str, int, str, str], rows: List[Tuple[int, InlineKeyboardButton]]):
+        game_id, round_number, phase, _ = key
+        for stale in [k for k in self._rows if k[0] == game_id and k[1:3] != (round_number, phase)]:
+            del self._rows[stale]
+        self._rows[key] = rows
+
+    def clear_game(self, game_id: str):
+        for key in [k for k in self._rows if k[0] == game_id]:
+            del self._rows[key]
+
+keyboard_cache = KeyboardCache()
+
 class Keyboards:
     @staticmethod
     def get_join_game_keyboard(game_id: str) -> InlineKeyboardMarkup:
@@ -25,21 +52,55 @@ class Keyboards:
         ]])
 
     @staticmethod
-    async def get_voting_keyboard(game_id: str) -> InlineKeyboardMarkup:
-        players = await db.get_players(game_id)
-        alive_players = [p for p in players if p.is_alive]
-        
-        buttons = []
-        for player in alive_players:
-            buttons.append([InlineKeyboardButton(
-                f"Vote Player {player.user_id}", 
-                callback_data=f"vote_{game_id}_{player.user_id}"
-            )])
+    async def get_voting_keyboard(game_id: str, names: Optional[Dict[int, str]] = None) -> InlineKeyboardMarkup:
+        rows = await Keyboards.get_target_buttons(game_id, "voter", "Vote", "vote", names)
         
+        buttons = [[button] for _, button in rows]
         buttons.append([InlineKeyboardButton("Skip Vote", callback_data=f"vote_skip_{game_id}")])
         
         return InlineKeyboardMarkup(buttons)
 
+    @staticmethod
+    async def get_target_buttons(game_id: str, viewer_class: str, label: str, action: str,
+                                 names: Optional[Dict[int, str]] = None,
+                                 include: Callable[[Player], bool] = lambda player: True) -> List[Tuple[int, InlineKeyboardButton]]:
+        """(target_id, button) for every alive target, built once per round, phase and viewer class.
+
+        Every recipient of the same prompt shares the rows; callers drop the viewer's own button.
+        """
+        session = game_sessions.get(game_id)
+        game = session.game if session else await db.get_game_by_id(game_id)
+        key = (game_id, game.round_number, game.phase.value, viewer_class) if game else None
+        rows = keyboard_cache.get(key) if key else None
+        if rows is not None:
+            return rows
+
+        alive = session.alive_players() if session else await db.get_alive_players(game_id)
+        targets = [p for p in alive if include(p)]
+        if names is None:
+            names = await db.get_display_names([p.user_id for p in targets])
+        
+        rows = [
+            (player.user_id, InlineKeyboardButton(
+                f"{label} {Messages.player_name(player.user_id, names)}",
+                callback_data=f"{action}_{game_id}_{player.user_id}"
+            ))
+            for player in targets
+        ]
+        if key:
+            keyboard_cache.put(key, rows)
+        return rows
+
+    @staticmethod
+    def clear_cached_keyboards(game_id: str):
+        keyboard_cache.clear_game(game_id)
+
+    @staticmethod
+    def get_ready_to_vote_keyboard(game_id: str) -> InlineKeyboardMarkup:
+        return InlineKeyboardMarkup([[
+            InlineKeyboardButton("✋ Ready to Vote", callback_data=f"ready_vote_{game_id}")
+        ]])
+
     @staticmethod
     def get_engineer_day_keyboard(game_id: str) -> InlineKeyboardMarkup:
         return InlineKeyboardMarkup([
@@ -57,28 +118,25 @@ class Keyboards:
         ])
         
     @staticmethod
-    async def get_impostor_night_keyboard(game_id: str, impostor_id: int) -> InlineKeyboardMarkup:
+    async def get_impostor_night_keyboard(game_id: str, impostor_id: int,
+                                          names: Optional[Dict[int, str]] = None) -> InlineKeyboardMarkup:
         """Generate kill target keyboard for impostors"""
-        players = await db.get_players(game_id)
-        alive_players = [p for p in players if p.is_alive and p.user_id != impostor_id]
-        
-        buttons = []
-        for player in alive_players:
-            buttons.append([InlineKeyboardButton(
-                f"Kill Player {player.user_id}", 
-                callback_data=f"impostor_kill_{game_id}_{player.user_id}"
-            )])
+        rows = await Keyboards.get_target_buttons(game_id, "impostor", "Kill", "impostor_kill", names)
         
+        buttons = [[button] for target_id, button in rows if target_id != impostor_id]
         buttons.append([InlineKeyboardButton("Skip", callback_data=f"impostor_skip_{game_id}")])
         return InlineKeyboardMarkup(buttons)
 
     @staticmethod
-    async def get_detective_night_keyboard(game_id: str, detective_id: int) -> InlineKeyboardMarkup:
+    async def get_detective_night_keyboard(game_id: str, detective_id: int,
+                                           names: Optional[Dict[int, str]] = None) -> InlineKeyboardMarkup:
         """Generate investigation keyboard for detectives"""
         # Check if detective can investigate this round
-        detectives = await db.get_players_by_role(game_id, Role.DETECTIVE)
-        alive_detectives = [d for d in detectives if d.is_alive]
-        round_number = await db.get_game_round(game_id)
+        session = game_sessions.get(game_id)
+        if session is None:
+            return None
+        alive_detectives = session.alive_by_role(Role.DETECTIVE)
+        round_number = session.round_number
         
         can_investigate = False
         if len(alive_detectives) == 1:
@@ -89,32 +147,19 @@ class Keyboards:
         if not can_investigate:
             return None
         
-        players = await db.get_players(game_id)
-        alive_players = [p for p in players if p.is_alive and p.user_id != detective_id]
-        
-        buttons = []
-        for player in alive_players:
-            buttons.append([InlineKeyboardButton(
-                f"Investigate Player {player.user_id}", 
-                callback_data=f"detective_investigate_{game_id}_{player.user_id}"
-            )])
+        rows = await Keyboards.get_target_buttons(game_id, "detective", "Investigate", "detective_investigate", names)
         
+        buttons = [[button] for target_id, button in rows if target_id != detective_id]
         buttons.append([InlineKeyboardButton("Skip", callback_data=f"detective_skip_{game_id}")])
         return InlineKeyboardMarkup(buttons)
 
     @staticmethod
-    async def get_sheriff_night_keyboard(game_id: str, sheriff_id: int) -> InlineKeyboardMarkup:
+    async def get_sheriff_night_keyboard(game_id: str, sheriff_id: int,
+                                         names: Optional[Dict[int, str]] = None) -> InlineKeyboardMarkup:
         """Generate shoot target keyboard for sheriff"""
-        players = await db.get_players(game_id)
-        alive_players = [p for p in players if p.is_alive and p.user_id != sheriff_id]
-        
-        buttons = []
-        for player in alive_players:
-            buttons.append([InlineKeyboardButton(
-                f"Shoot Player {player.user_id}", 
-                callback_data=f"sheriff_shoot_{game_id}_{player.user_id}"
-            )])
+        rows = await Keyboards.get_target_buttons(game_id, "sheriff", "Shoot", "sheriff_shoot", names)
         
+        buttons = [[button] for target_id, button in rows if target_id != sheriff_id]
         buttons.append([InlineKeyboardButton("Skip", callback_data=f"sheriff_skip_{game_id}")])
         return InlineKeyboardMarkup(buttons)
 
@@ -1,11 +1,17 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from src.database.models import GameMode, Role
 
 class Messages:
     @staticmethod
-    def get_lobby_message(players: List[int], mode: GameMode, creator_id: int) -> str:
-        return f"🎭 {mode.value.title()} Game Lobby is forming...\n\nCreator: Player {creator_id}\n\nCurrent Players ({len(players)}/20):\n" + \
-               "\n".join([f"• Player {player_id}" for player_id in players]) + \
+    def player_name(user_id: int, names: Optional[Dict[int, str]] = None) -> str:
+        """Display name from a names mapping (see Database.get_display_names), falling back to the id"""
+        return (names or {}).get(user_id) or f"Player {user_id}"
+
+    @staticmethod
+    def get_lobby_message(players: List[int], mode: GameMode, creator_id: int,
+                          names: Optional[Dict[int, str]] = None) -> str:
+        return f"🎭 {mode.value.title()} Game Lobby is forming...\n\nCreator: {Messages.player_name(creator_id, names)}\n\nCurrent Players ({len(players)}/20):\n" + \
+               "\n".join([f"• {Messages.player_name(player_id, names)}" for player_id in players]) + \
                f"\n\nStill waiting for {max(0, 4 - len(players))} more brave souls to join the chaos..."
 
     @staticmethod
@@ -17,15 +23,16 @@ class Messages:
         return "🌙 Night falls... Everyone close your eyes (or pretend to). Roles, perform your secret deeds!"
 
     @staticmethod
-    def get_day_phase_message(alive_players: List[int], night_summary: Dict[str, Any]) -> str:
+    def get_day_phase_message(alive_players: List[int], night_summary: Dict[str, Any],
+                              names: Optional[Dict[int, str]] = None) -> str:
         msg = f"☀️ Day {night_summary['round_number']} - Time to point fingers and blame each other!\n\n"
         msg += f"Survivors ({len(alive_players)}):\n"
-        msg += "\n".join([f"• Player {player_id}" for player_id in alive_players])
+        msg += "\n".join([f"• {Messages.player_name(player_id, names)}" for player_id in alive_players])
         
         if night_summary['deaths']:
             msg += "\n\n💀 Casualties of the night:\n"
             for death in night_summary['deaths']:
-                msg += f"• Player {death['user_id']} ({death['role']}) - {death['cause']}\n"
+                msg += f"• {Messages.player_name(death['user_id'], names)} ({death['role']}) - {death['cause']}\n"
         else:
             msg += "\n\n✅ Somehow, everyone survived the night. Suspicious..."
         
@@ -39,18 +46,21 @@ class Messages:
         return "🗳️ Voting phase has begun! Choose wisely... or just point at someone random. Your call."
 
     @staticmethod
-    def get_voting_result_message(ejected_player: int, player_role: str) -> str:
+    def get_voting_result_message(ejected_player: int, player_role: str,
+                                  names: Optional[Dict[int, str]] = None) -> str:
         if ejected_player:
-            return f"⚖️ Player {ejected_player} ({player_role}) has been ejected! Was it the right choice? 😏"
+            return f"⚖️ {Messages.player_name(ejected_player, names)} ({player_role}) has been ejected! Was it the right choice? 😏"
         else:
             return "⚖️ No one was ejected. Either you're all innocent or all terrible at voting."
 
     @staticmethod
-    def get_game_end_message(win_condition: str, winners: List[int]) -> str:
+    def get_game_end_message(win_condition: str, winners: List[int],
+                             names: Optional[Dict[int, str]] = None) -> str:
+        winner_names = ', '.join(Messages.player_name(winner, names) for winner in winners)
         if win_condition == "crewmates":
-            return f"🎉 Crewmates Win!\nThe good guys somehow managed to not kill each other.\nWinners: {', '.join(map(str, winners))}"
+            return f"🎉 Crewmates Win!\nThe good guys somehow managed to not kill each other.\nWinners: {winner_names}"
         elif win_condition == "impostors":
-            return f"🔪 Impostors Win!\nChaos reigns supreme as usual.\nWinners: {', '.join(map(str, winners))}"
+            return f"🔪 Impostors Win!\nChaos reigns supreme as usual.\nWinners: {winner_names}"
         else:
             return "💥 Ship exploded! Well, that's what happens when you don't do your tasks. Everyone loses!"
 
@@ -99,12 +109,12 @@ class Messages:
         return descriptions.get(role, "Unknown role. How did you even get this?")
 
     @staticmethod
-    def get_detective_result_message(target_id: int, result: str) -> str:
+    def get_detective_result_message(target_id: int, result: str, names: Optional[Dict[int, str]] = None) -> str:
         """Format detective investigation results"""
-        return f"🕵️ Investigation Results:\nPlayer {target_id} is: **{result}**\n\nKeep this to yourself, detective!"
+        return f"🕵️ Investigation Results:\n{Messages.player_name(target_id, names)} is: **{result}**\n\nKeep this to yourself, detective!"
 
     @staticmethod
-    def get_vote_breakdown_message(votes: Dict[int, int]) -> str:
+    def get_vote_breakdown_message(votes: Dict[int, int], names: Optional[Dict[int, str]] = None) -> str:
         """Format voting breakdown"""
         if not votes:
             return "📊 No votes were cast. Democracy failed spectacularly."
@@ -114,7 +124,7 @@ class Messages:
             if target_id == -1:  # Skip votes
                 msg += f"• Skip: {vote_count} votes (playing it safe, huh?)\n"
             else:
-                msg += f"• Player {target_id}: {vote_count} votes\n"
+                msg += f"• {Messages.player_name(target_id, names)}: {vote_count} votes\n"
         
         return msg
 
@@ -28,4 +28,94 @@ except (ValueError, TypeError):
 try:
     BOT_LOG_CHANNEL_ID = int(os.getenv("BOT_LOG_CHANNEL_ID", 0))
 except (ValueError, TypeError):
-    BOT_LOG_CHANNEL_ID = 0
\ No newline at end of file
+    BOT_LOG_CHANNEL_ID = 0
+
+# Database pool sizing - min_size connections are opened at startup
+try:
+    DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 5))
+except (ValueError, TypeError):
+    DB_POOL_MIN_SIZE = 5
+
+try:
+    DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 20))
+except (ValueError, TypeError):
+    DB_POOL_MAX_SIZE = 20
+
+# Idle pooled connections are closed and replaced after this many seconds
+try:
+    DB_POOL_MAX_INACTIVE_LIFETIME = float(os.getenv("DB_POOL_MAX_INACTIVE_LIFETIME", 300))
+except (ValueError, TypeError):
+    DB_POOL_MAX_INACTIVE_LIFETIME = 300.0
+
+# Retention: ended games leave the hot tables after ARCHIVE_AFTER_HOURS,
+# archived votes are purged after VOTE_RETENTION_DAYS (0 keeps them forever)
+try:
+    ARCHIVE_AFTER_HOURS = float(os.getenv("ARCHIVE_AFTER_HOURS", 24))
+except (ValueError, TypeError):
+    ARCHIVE_AFTER_HOURS = 24.0
+
+try:
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 500))
+except (ValueError, TypeError):
+    ARCHIVE_BATCH_SIZE = 500
+
+try:
+    ARCHIVE_INTERVAL_SECONDS = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", 3600))
+except (ValueError, TypeError):
+    ARCHIVE_INTERVAL_SECONDS = 3600
+
+try:
+    VOTE_RETENTION_DAYS = int(os.getenv("VOTE_RETENTION_DAYS", 90))
+except (ValueError, TypeError):
+    VOTE_RETENTION_DAYS = 90
+
+# In-process user profile cache
+try:
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 5000))
+except (ValueError, TypeError):
+    USER_CACHE_SIZE = 5000
+
+try:
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 600))
+except (ValueError, TypeError):
+    USER_CACHE_TTL = 600.0
+
+# Cross-process cache invalidation (LISTEN/NOTIFY)
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "among_us_cache")
+
+try:
+    CACHE_INVALIDATION_DELAY = float(os.getenv("CACHE_INVALIDATION_DELAY", 0.05))
+except (ValueError, TypeError):
+    CACHE_INVALIDATION_DELAY = 0.05
+
+try:
+    BAN_SWEEP_INTERVAL = int(os.getenv("BAN_SWEEP_INTERVAL", 60))
+except (ValueError, TypeError):
+    BAN_SWEEP_INTERVAL = 60
+
+try:
+    ADMIN_CACHE_TTL = int(os.getenv("ADMIN_CACHE_TTL", 600))
+except (ValueError, TypeError):
+    ADMIN_CACHE_TTL = 600
+
+try:
+    NAME_CACHE_SIZE = int(os.getenv("NAME_CACHE_SIZE", 20000))
+except (ValueError, TypeError):
+    NAME_CACHE_SIZE = 20000
+
+# Write-behind journal for live game state
+try:
+    JOURNAL_FLUSH_DELAY = float(os.getenv("JOURNAL_FLUSH_DELAY", 0.05))
+except (ValueError, TypeError):
+    JOURNAL_FLUSH_DELAY = 0.05
+
+try:
+    JOURNAL_BATCH_SIZE = int(os.getenv("JOURNAL_BATCH_SIZE", 500))
+except (ValueError, TypeError):
+    JOURNAL_BATCH_SIZE = 500
+
+# How long ending a game or shutting down waits for the journal before giving up
+try:
+    JOURNAL_DRAIN_TIMEOUT = float(os.getenv("JOURNAL_DRAIN_TIMEOUT", 10))
+except (ValueError, TypeError):
+    JOURNAL_DRAIN_TIMEOUT = 10.0
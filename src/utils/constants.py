@@ -5,6 +5,16 @@ NIGHT_PHASE_DURATION = 60
 DISCUSSION_DURATION = 90
 VOTING_DURATION = 30
 
+# Share of alive players whose "ready to vote" ends discussion early; 0 hides the button
+READY_TO_VOTE_QUORUM = 0.66
+
+# Back-off (seconds) before re-probing a user whose DMs failed
+DM_RETRY_BASE = 300
+DM_RETRY_MAX = 6 * 3600
+
+# Long names are cut so roster messages and buttons stay readable
+DISPLAY_NAME_MAX_LENGTH = 32
+
 MIN_PLAYERS = 4
 MAX_PLAYERS = 20
 